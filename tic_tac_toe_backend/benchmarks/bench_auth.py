@@ -0,0 +1,35 @@
+"""Benchmark: per-request cost of get_current_user with and without the verified-token cache.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_auth [N]
+"""
+import asyncio
+import sys
+import time
+
+from src.api import main as api
+from src.api.auth_cache import TokenCache
+
+
+async def authenticate(token: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await api.get_current_user(token)
+    return (time.perf_counter() - start) / n
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    api.storage.add_user("bench@example.com", "bench", "x")
+    token = api.create_access_token({"sub": "bench@example.com"})
+
+    api.token_cache = TokenCache(max_entries=0)
+    uncached = asyncio.run(authenticate(token, n))
+    api.token_cache = TokenCache()
+    cached = asyncio.run(authenticate(token, n))
+    print(f"requests: {n:,}")
+    print(f"jwt.decode + user lookup: {uncached * 1e6:8.2f} us/request")
+    print(f"token cache hit:          {cached * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark: NumPy batch evaluation vs one TicTacToeGame.check_winner per board.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_batch [M]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.api.batch import EMPTY, O, X, evaluate
+from src.api.core import TicTacToeGame
+
+SYMBOLS = {EMPTY: None, X: "X", O: "O"}
+LOOP_SAMPLE = 100_000
+
+
+def main() -> None:
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    boards = rng.integers(0, 3, size=(m, 9), dtype=np.int8)
+
+    start = time.perf_counter()
+    result = evaluate(boards)
+    batch = time.perf_counter() - start
+
+    sample = boards[:min(m, LOOP_SAMPLE)]
+    lists = [[[SYMBOLS[v] for v in b[r * 3:r * 3 + 3]] for r in range(3)] for b in sample.tolist()]
+    start = time.perf_counter()
+    loop_winners = [TicTacToeGame(board).check_winner() for board in lists]
+    loop = (time.perf_counter() - start) * m / len(sample)
+
+    # Sanity check on boards with at most one winning side.
+    expected = np.array([{None: 0, "X": X, "O": O}[w] for w in loop_winners], dtype=np.int8)
+    single = result.winners[:len(sample)] == expected
+    print(f"boards: {m:,}  agreement on sample: {single.mean():.4f} (differs only where both sides have a line)")
+    print(f"batch evaluate: {batch:8.3f} s  ({m / batch / 1e6:6.2f} M boards/s)")
+    print(f"per-board loop: {loop:8.3f} s  (extrapolated from {len(sample):,} boards)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Micro-benchmark: list-based TicTacToeGame vs BitboardGame.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_bitboard
+"""
+import timeit
+
+from src.api.bitboard import BitboardGame
+from src.api.core import TicTacToeGame
+
+# X wins on the last move; every call to check_winner/is_draw sees a busy board.
+MOVES = [(0, 0), (1, 1), (0, 1), (2, 2), (1, 0), (0, 2), (2, 0)]
+NUMBER = 20000
+
+
+def play(cls) -> None:
+    game = cls()
+    for row, col in MOVES:
+        game.make_move(row, col, game.current)
+        game.check_winner()
+        game.is_draw()
+
+
+def main() -> None:
+    for cls in (TicTacToeGame, BitboardGame):
+        game = cls()
+        for row, col in MOVES[:-1]:
+            game.make_move(row, col, game.current)
+        # make_move tracks status incrementally; time the full scan used on load.
+        check = timeit.timeit(game._scan_winner, number=NUMBER * 10)
+        full = timeit.timeit(lambda: play(cls), number=NUMBER)
+        print(f"{cls.__name__:>14}: full scan {check / (NUMBER * 10) * 1e9:8.0f} ns/call, "
+              f"full game {full / NUMBER * 1e6:8.2f} us/game")
+
+
+if __name__ == "__main__":
+    main()
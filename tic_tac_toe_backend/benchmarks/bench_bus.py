@@ -0,0 +1,75 @@
+"""Benchmark: message bus throughput, in game updates per second.
+
+Publishes N one-move updates (with their event) and times until a second
+subscriber has them all: the in-process bus, and two UnixSocketBus
+instances talking through the relay, as two workers would. Both socket
+ends share this process's event loop, so that figure is a lower bound.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_bus [N]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from src.api.bus import GameUpdate, InProcessBus, UnixSocketBus
+from src.api.events import MOVE, GameEvent
+
+
+def update(i: int) -> GameUpdate:
+    event = GameEvent(i, 1, MOVE, {"player": "alice", "row": 1, "col": 1, "symbol": "X"})
+    return GameUpdate(i, 3, ("alice", "bob"), [(1, 1, "X")], None, False, "O", [event])
+
+
+async def in_process(n: int) -> float:
+    bus = InProcessBus()
+    received = []
+    bus.subscribe(lambda u, remote: received.append(u))
+    updates = [update(i) for i in range(n)]
+    start = time.perf_counter()
+    for u in updates:
+        bus.publish(u)
+    return n / (time.perf_counter() - start)
+
+
+async def unix_socket(n: int) -> float:
+    path = os.path.join(tempfile.mkdtemp(), "bus.sock")
+    publisher, receiver = UnixSocketBus(path), UnixSocketBus(path)
+    await publisher.start()
+    await receiver.start()
+    done = asyncio.Event()
+    count = 0
+
+    def on_update(_update: GameUpdate, remote: bool) -> None:
+        nonlocal count
+        count += remote
+        if count == n:
+            done.set()
+
+    receiver.subscribe(on_update)
+    updates = [update(i) for i in range(n)]
+    start = time.perf_counter()
+    for i, u in enumerate(updates):
+        publisher.publish(u)
+        if i % 256 == 255:
+            await asyncio.sleep(0)  # let the relay and receiver run, as a server would between requests
+    await asyncio.wait_for(done.wait(), 60)
+    rate = n / (time.perf_counter() - start)
+    dropped = publisher.dropped
+    await receiver.stop()
+    await publisher.stop()
+    if dropped:
+        print(f"  ({dropped:,} updates dropped by the publisher's buffer limit)")
+    return rate
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"updates: {n:,}")
+    print(f"InProcessBus:  {asyncio.run(in_process(n)):>12,.0f} updates/s")
+    print(f"UnixSocketBus: {asyncio.run(unix_socket(n)):>12,.0f} updates/s (publish, relay, decode, deliver)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark: batch Elo recomputation over the full history vs one elo_update per game.
+
+Synthetic history of M games between P players, 10% of them against the AI.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_ratings [M] [P]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.api.ratings import GameArrays, batch_elo, elo_update
+
+LOOP_SAMPLE = 1_000_000
+
+
+def main() -> None:
+    m = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    p = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    rng = np.random.default_rng(0)
+    names = [f"user{i}" for i in range(p)] + ["AI"]
+    a = rng.integers(0, p, size=m, dtype=np.int32)
+    b = rng.integers(0, p, size=m, dtype=np.int32)
+    b[rng.random(m) < 0.1] = p
+    score = rng.choice(np.array([0.0, 0.5, 1.0]), size=m)
+    games = GameArrays(names, a, b, score)
+
+    start = time.perf_counter()
+    ratings = batch_elo(games)
+    batch = time.perf_counter() - start
+
+    n = min(m, LOOP_SAMPLE)
+    loop_ratings = {name: 1500.0 for name in names}
+    start = time.perf_counter()
+    for x, y, s in zip(a[:n].tolist(), b[:n].tolist(), score[:n].tolist()):
+        nx, ny = elo_update(loop_ratings[names[x]], loop_ratings[names[y]], s)
+        loop_ratings[names[x]] = nx
+        if y != p:
+            loop_ratings[names[y]] = ny
+    loop = (time.perf_counter() - start) * m / n
+
+    check = batch_elo(GameArrays(names, a[:n], b[:n], score[:n]))
+    drift = max(abs(check[i] - loop_ratings[name]) for i, name in enumerate(names))
+    print(f"games: {m:,}  players: {p:,}  max |batch - loop| on {n:,} games: {drift:.2e}")
+    print(f"batch_elo:        {batch:8.2f} s  ({m / batch / 1e6:5.2f} M games/s)  top rating {ratings[:p].max():.1f}")
+    print(f"per-game loop:    {loop:8.2f} s  (extrapolated from {n:,} games)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: rebuilding live games from their event logs, as startup recovery does.
+
+Compares a full replay from seq 0 with restoring the latest snapshot and
+replaying only the events after it, for 100k random 3x3 games (all unfinished,
+cut off at a random point, like games caught by a crash).
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_replay [N] [SNAPSHOT_EVERY]
+"""
+import random
+import sys
+import time
+
+from src.api.bitboard import BitboardGame
+from src.api.events import CREATED, MOVE, GameEvent, apply_event, replay, take_snapshot
+from src.api.session import GameSession
+from src.api.storage import MemoryStorage
+
+
+def fresh_record() -> GameSession:
+    return GameSession(0, BitboardGame(), ("a", "b"), False, 0)
+
+
+def record_games(storage: MemoryStorage, n: int, snapshot_every: int, rng: random.Random) -> None:
+    for _ in range(n):
+        gid = storage.create_game(["a", "b"], [1, 2], False, 3, 3, None)
+        rec = fresh_record()
+        events, snapshots = [], []
+
+        def emit(kind: str, data: dict) -> None:
+            event = GameEvent(gid, rec.seq, kind, data)
+            apply_event(rec, event)
+            events.append(event)
+            if rec.seq - rec.snapshot_seq >= snapshot_every:
+                snapshots[:] = [dict(take_snapshot(rec), game_id=gid)]
+                rec.snapshot_seq = rec.seq
+
+        emit(CREATED, {"players": ["a", "b"], "is_ai": False, "size": 3, "k": 3, "created_at": None})
+        cells = rng.sample(range(9), rng.randint(1, 8))
+        for cell in cells:
+            game = rec.game
+            emit(MOVE, {"player": "a", "row": cell // 3, "col": cell % 3, "symbol": game.current})
+            if game.winner:
+                break
+        storage.write_events(events, snapshots)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    snapshot_every = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    storage = MemoryStorage()
+    record_games(storage, n, snapshot_every, random.Random(1))
+    gids = storage.unfinished_game_ids()
+    events = sum(len(storage.get_events(gid)) for gid in gids)
+    print(f"games: {len(gids):,}  events: {events:,}  snapshot every {snapshot_every} events")
+
+    start = time.perf_counter()
+    for gid in gids:
+        replay(fresh_record(), None, storage.get_events(gid))
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for gid in gids:
+        snapshot = storage.get_snapshot(gid)
+        replay(fresh_record(), snapshot, storage.get_events(gid, since=snapshot["seq"] if snapshot else 0))
+    snap = time.perf_counter() - start
+
+    print(f"full replay:         {full:8.3f} s  ({full / len(gids) * 1e6:6.2f} us/game)")
+    print(f"snapshot + tail:     {snap:8.3f} s  ({snap / len(gids) * 1e6:6.2f} us/game)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Memory benchmark: bytes per live game in sessions_db, at 1M games.
+
+Compares the old dict record (list-of-lists TicTacToeGame, move dicts,
+datetime, players list) with the slotted GameSession, both mid-game with
+the same four moves played. Usernames are shared between games, as they
+are in the server (they come from the user records).
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_sessions [N]
+"""
+import gc
+import sys
+import tracemalloc
+from datetime import datetime
+
+from src.api.archive import to_epoch_us
+from src.api.bitboard import BitboardGame
+from src.api.core import TicTacToeGame
+from src.api.session import GameSession
+
+MOVES = [(1, 1), (0, 0), (2, 2), (0, 2)]
+PLAYERS = ["alice", "AI"]
+
+
+def dict_record(game_id: int) -> dict:
+    game = TicTacToeGame()
+    rec = {"id": game_id, "game": game, "players": list(PLAYERS), "is_ai": True, "player_turn": PLAYERS[0],
+           "moves": [], "created_at": datetime.utcnow(), "winner": None}
+    for row, col in MOVES:
+        symbol = game.current
+        game.make_move(row, col, symbol)
+        rec["moves"].append({"player": PLAYERS[0], "pos": (row, col), "symbol": symbol})
+    return rec
+
+
+def slotted_record(game_id: int) -> GameSession:
+    session = GameSession(game_id, BitboardGame(), tuple(PLAYERS), True, to_epoch_us(datetime.utcnow()))
+    for row, col in MOVES:
+        session.game.make_move(row, col, session.game.current)
+        session.add_move(row, col)
+    return session
+
+
+def measure(build, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    sessions = {gid: build(gid) for gid in range(n)}
+    used, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return used / n
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"live games: {n:,}")
+    for name, build in (("dict + TicTacToeGame", dict_record), ("GameSession + bitboard", slotted_record)):
+        per_game = measure(build, n)
+        print(f"{name:24s} {per_game:8.0f} bytes/game  {per_game * n / 2 ** 20:8.1f} MiB total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark: indexed UserStore vs scanning a dict of users, at 1M users.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_user_store [N]
+"""
+import sys
+import time
+
+from src.api.user_store import UserStore
+
+SCANS = 5
+LOOKUPS = 100_000
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = UserStore()
+    start = time.perf_counter()
+    for i in range(n):
+        store.add(f"user{i}@example.com", f"user{i}", "x")
+    print(f"users: {n:,}  register: {(time.perf_counter() - start) / n * 1e6:.2f} us/user")
+
+    # The old users_db layout: email -> record, username found by scanning values.
+    by_email = {u["email"]: u for u in (store.get_by_id(i) for i in range(1, n + 1))}
+    target = f"user{n - 1}"
+    start = time.perf_counter()
+    for _ in range(SCANS):
+        next(u for u in by_email.values() if u["username"] == target)
+    scan = (time.perf_counter() - start) / SCANS
+
+    names = [f"user{i}" for i in range(0, n, max(1, n // LOOKUPS))]
+    start = time.perf_counter()
+    for name in names:
+        store.get_by_username(name)
+    indexed = (time.perf_counter() - start) / len(names)
+    print(f"username lookup, scan:    {scan * 1e3:10.3f} ms")
+    print(f"username lookup, indexed: {indexed * 1e6:10.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark: /ws/game frame size and encode cost, JSON text against the ttt.bin.v1 binary format.
+
+Encodes a state frame and a one-move delta frame for a 3x3 game and a
+15x15 game, each four moves in, the way the server does for every
+subscriber codec.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_wire [N]
+"""
+import sys
+import time
+
+from src.api import main as api
+from src.api.bus import GameUpdate
+from src.api.session import GameSession
+from src.api.wire import BINARY, JSON
+
+MOVES = [(1, 1), (0, 0), (2, 2), (0, 2)]
+
+
+def session(size: int) -> GameSession:
+    game_rec = GameSession(1, api.new_game(size, min(size, 5)), ("x", "o"), False, 0)
+    for row, col in MOVES:
+        game_rec.game.make_move(row, col, game_rec.game.current)
+        game_rec.add_move(row, col)
+    return game_rec
+
+
+def cost(encode, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        encode()
+    return (time.perf_counter() - start) / n
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{'frame':<16}{'codec':<8}{'bytes':>7}{'us/encode':>11}")
+    for size in (3, 15):
+        game_rec = session(size)
+        delta = GameUpdate(1, size, game_rec.players, [(0, 2, "O")], None, False, "X", [])
+        for codec in (JSON, BINARY):
+            frames = {
+                "state": lambda: api.state_frame(game_rec, codec),
+                "delta": lambda: api.delta_frame(delta, codec),
+            }
+            for kind, encode in frames.items():
+                print(f"{f'{size}x{size} {kind}':<16}{codec:<8}{len(encode()):>7}{cost(encode, n) * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
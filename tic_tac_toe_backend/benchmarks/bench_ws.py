@@ -0,0 +1,72 @@
+"""Benchmark: per-move cost of POST /make_move against move frames on /ws/game.
+
+Plays N human-vs-human 3x3 games (X wins in five moves) in-process through
+Starlette's TestClient, once over HTTP (JWT check and Pydantic request
+validation per move) and once over two WebSockets authenticated at connect,
+waiting for each move's delta before sending the next.
+
+Run from tic_tac_toe_backend/:  python -m benchmarks.bench_ws [N]
+"""
+import json
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from src.api import main as api
+
+MOVES = [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)]
+
+
+def register(client: TestClient, name: str) -> str:
+    body = {"email": f"{name}@example.com", "username": name, "password": "secret1"}
+    return client.post("/register", json=body).json()["access_token"]
+
+
+def new_game(client: TestClient, token: str, opponent: str) -> int:
+    body = {"opponent_type": "human", "opponent_username": opponent}
+    return client.post("/new_game", json=body, headers={"Authorization": f"Bearer {token}"}).json()
+
+
+def http_games(client: TestClient, tokens, n: int) -> float:
+    headers = [{"Authorization": f"Bearer {t}"} for t in tokens]
+    elapsed = 0.0
+    for _ in range(n):
+        gid = new_game(client, tokens[0], "bench_o")
+        start = time.perf_counter()
+        for i, (row, col) in enumerate(MOVES):
+            client.post("/make_move", json={"game_id": gid, "row": row, "col": col}, headers=headers[i % 2])
+        elapsed += time.perf_counter() - start
+    return elapsed / (n * len(MOVES))
+
+
+def ws_games(client: TestClient, tokens, n: int) -> float:
+    elapsed = 0.0
+    for _ in range(n):
+        gid = new_game(client, tokens[0], "bench_o")
+        with client.websocket_connect(f"/ws/game/{gid}?token={tokens[0]}") as x, \
+                client.websocket_connect(f"/ws/game/{gid}?token={tokens[1]}") as o:
+            x.receive_text()
+            o.receive_text()
+            start = time.perf_counter()
+            for i, (row, col) in enumerate(MOVES):
+                (x, o)[i % 2].send_text(json.dumps({"type": "move", "row": row, "col": col}))
+                x.receive_text()
+                o.receive_text()
+            elapsed += time.perf_counter() - start
+    return elapsed / (n * len(MOVES))
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with TestClient(api.app) as client:
+        tokens = [register(client, "bench_x"), register(client, "bench_o")]
+        http = http_games(client, tokens, n)
+        ws = ws_games(client, tokens, n)
+    print(f"games: {n:,} ({n * len(MOVES):,} moves)")
+    print(f"POST /make_move:     {http * 1e6:8.1f} us/move")
+    print(f"/ws/game move frame: {ws * 1e6:8.1f} us/move (both players' deltas received)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .core import ai_move
+
+EXECUTOR_KINDS = ("process", "thread")
+
+
+def _warm_up() -> None:
+    """Runs in each worker: load the precomputed tables before the first real move."""
+    from . import ai_table, mcts, search  # noqa: F401  (import builds the tables)
+
+    search.line_masks(3, 3)
+
+
+# PUBLIC_INTERFACE
+class AIExecutor:
+    """Runs ai_move off the event loop in a process or thread pool.
+
+    Each move has a deadline; if it passes, the caller gets the naive
+    first-empty-cell move instead (the worker finishes in the background).
+    Moves that carry a per-game MCTS engine always run on threads, in the
+    main pool or, with kind="process", a thread pool of their own, so the
+    engine's tree stays in this process and is reused by the next move. An
+    engine whose previous search overran its deadline is still being
+    mutated by it, so that move searches on a fresh clone instead.
+    """
+
+    def __init__(self, kind: str = "process", workers: int = 2, deadline: float = 2.0):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.deadline = deadline
+        self._executor: Optional[Executor] = None
+        self._engine_executor: Optional[Executor] = None  # kind="process" only: threads for MCTS engines
+        self._searches: "weakref.WeakKeyDictionary[object, asyncio.Future]" = weakref.WeakKeyDictionary()
+        self.submitted = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.engines_busy = 0  # moves searched on a clone because the engine was still busy
+        self._total_seconds = 0.0
+
+    # PUBLIC_INTERFACE
+    async def start(self) -> None:
+        """Create the pool and wait until every worker has loaded the AI tables."""
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+            self._engine_executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="mcts", initializer=_warm_up
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="ai", initializer=_warm_up
+            )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)))
+
+    # PUBLIC_INTERFACE
+    def shutdown(self) -> None:
+        for executor in (self._executor, self._engine_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._engine_executor = None
+
+    def _done(self, _future) -> None:
+        self.completed += 1
+
+    # PUBLIC_INTERFACE
+    async def move(self, board: List[List[Optional[str]]], symbol: str, mode: str, k: Optional[int] = None,
+                   engine=None) -> Tuple[int, int]:
+        """ai_move in the pool, falling back to the naive move after `deadline` seconds."""
+        if self._executor is None:
+            await self.start()
+        executor = self._executor
+        if engine is not None:
+            running = self._searches.get(engine)
+            if running is not None and not running.done():
+                engine = engine.clone()
+                self.engines_busy += 1
+            executor = self._engine_executor or executor
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, ai_move, board, symbol, mode, k, engine)
+        future.add_done_callback(self._done)
+        if engine is not None:
+            self._searches[engine] = future
+        self.submitted += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except Exception:
+            self.failures += 1
+        finally:
+            self._total_seconds += time.perf_counter() - start
+        return ai_move(board, symbol, "naive")
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        in_flight = self.submitted - self.completed
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "deadline_seconds": self.deadline,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "engines_busy": self.engines_busy,
+            "avg_wait_seconds": round(self._total_seconds / self.submitted, 6) if self.submitted else 0.0,
+        }
@@ -0,0 +1,122 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .bitboard import CELL_COUNT, FULL_MASK, has_win
+from .symmetry import canonicalize_bits, unmap_cell
+
+# A position is indexed by the base-3 code of its canonical (symmetry-reduced)
+# form: digit i is 0 (empty), 1 (X) or 2 (O) for cell i. X always moves first,
+# so the side to move follows from the counts.
+STATE_COUNT = 3 ** CELL_COUNT
+NO_MOVE = -1
+
+# Base-3 contribution of every 9-bit mask, so encoding is two lookups.
+_TERNARY: Tuple[int, ...] = tuple(
+    sum(3 ** i for i in range(CELL_COUNT) if mask >> i & 1) for mask in range(FULL_MASK + 1)
+)
+
+
+# PUBLIC_INTERFACE
+def encode(x_bits: int, o_bits: int) -> int:
+    """Base-3 index of a position given the X and O bitboards."""
+    return _TERNARY[x_bits] + 2 * _TERNARY[o_bits]
+
+
+# PUBLIC_INTERFACE
+def decode(code: int) -> Tuple[int, int]:
+    """Inverse of encode(): (x_bits, o_bits) for a base-3 code."""
+    x_bits = o_bits = 0
+    for i in range(CELL_COUNT):
+        code, digit = divmod(code, 3)
+        if digit == 1:
+            x_bits |= 1 << i
+        elif digit == 2:
+            o_bits |= 1 << i
+    return x_bits, o_bits
+
+
+# PUBLIC_INTERFACE
+def canonical_code(x_bits: int, o_bits: int) -> int:
+    """Base-3 code shared by every board in the position's symmetry class."""
+    cx, co, _ = canonicalize_bits(x_bits, o_bits)
+    return encode(cx, co)
+
+
+def _solve(x_bits: int, o_bits: int, scores: Dict[int, int], moves: array) -> int:
+    """Negamax over every reachable position; fills moves[code] with the best cell.
+
+    Scores are from the side to move: faster wins score higher, slower losses
+    score less negatively, draws are 0. Only canonical positions are stored, and
+    their moves are in the canonical frame.
+    """
+    x_bits, o_bits, _ = canonicalize_bits(x_bits, o_bits)
+    code = encode(x_bits, o_bits)
+    if code in scores:
+        return scores[code]
+    x_to_move = bin(x_bits).count("1") == bin(o_bits).count("1")
+    mine, theirs = (x_bits, o_bits) if x_to_move else (o_bits, x_bits)
+    occupied = x_bits | o_bits
+    empties_after = CELL_COUNT - bin(occupied).count("1") - 1
+    best_score, best_cell = -CELL_COUNT - 1, NO_MOVE
+    for cell in range(CELL_COUNT):
+        bit = 1 << cell
+        if occupied & bit:
+            continue
+        played = mine | bit
+        if has_win(played):
+            score = empties_after + 1
+        elif empties_after == 0:
+            score = 0
+        elif x_to_move:
+            score = -_solve(played, theirs, scores, moves)
+        else:
+            score = -_solve(theirs, played, scores, moves)
+        if score > best_score:
+            best_score, best_cell = score, cell
+    scores[code] = best_score
+    moves[code] = best_cell
+    return best_score
+
+
+def _build() -> Tuple[array, int]:
+    moves = array("b", [NO_MOVE]) * STATE_COUNT
+    scores: Dict[int, int] = {}
+    _solve(0, 0, scores, moves)
+    return moves, len(scores)
+
+
+# Built once at import (627 canonical positions covering all 4,520 reachable
+# non-terminal boards). One signed byte per base-3 code: the best cell, or NO_MOVE
+# for finished, unreachable and non-canonical boards.
+BEST_MOVES, SOLVED_STATES = _build()
+
+
+# PUBLIC_INTERFACE
+def best_move(x_bits: int, o_bits: int) -> int:
+    """Best cell for the side to move, or NO_MOVE if the game is over."""
+    cx, co, t = canonicalize_bits(x_bits, o_bits)
+    cell = BEST_MOVES[encode(cx, co)]
+    return cell if cell == NO_MOVE else unmap_cell(cell, t)
+
+
+# PUBLIC_INTERFACE
+def best_move_for_board(board: List[List[Optional[str]]], symbol: str) -> Tuple[int, int]:
+    """Perfect-play (row, col) for `symbol` on a list-of-lists board, or (-1, -1).
+
+    Cells holding `symbol` belong to the mover; any other mark is the opponent.
+    """
+    mine = theirs = 0
+    for r, row in enumerate(board):
+        for c, cell in enumerate(row):
+            if cell == symbol:
+                mine |= 1 << (r * 3 + c)
+            elif cell is not None:
+                theirs |= 1 << (r * 3 + c)
+    # The mover plays X's role if both sides have placed the same number of marks.
+    if bin(mine).count("1") == bin(theirs).count("1"):
+        cell = best_move(mine, theirs)
+    else:
+        cell = best_move(theirs, mine)
+    if cell == NO_MOVE or (mine | theirs) >> cell & 1:
+        return -1, -1
+    return divmod(cell, 3)
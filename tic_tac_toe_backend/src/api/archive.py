@@ -0,0 +1,138 @@
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from .session import GameSession
+
+NIBBLE_PAD = 0xF  # never a 3x3 cell index, so it marks an odd move count
+EPOCH = datetime(1970, 1, 1)
+
+
+# PUBLIC_INTERFACE
+def to_epoch_us(dt: Optional[datetime]) -> Optional[int]:
+    """Naive-UTC datetime (as from datetime.utcnow()) to integer microseconds since the epoch."""
+    return None if dt is None else (dt - EPOCH) // timedelta(microseconds=1)
+
+
+# PUBLIC_INTERFACE
+def from_epoch_us(ts: Optional[int]) -> Optional[datetime]:
+    """Inverse of to_epoch_us()."""
+    return None if ts is None else EPOCH + timedelta(microseconds=ts)
+
+
+# PUBLIC_INTERFACE
+def pack_moves(cells: Sequence[int], size: int) -> bytes:
+    """Encode move cell indices (row * size + col) in play order.
+
+    3x3 games use one nibble per move, so a full game fits in 5 bytes. Larger
+    boards have too many cells for a nibble and use 2 bytes per move.
+    """
+    if size * size < NIBBLE_PAD:
+        padded = list(cells) + [NIBBLE_PAD] * (len(cells) % 2)
+        return bytes((padded[i] << 4) | padded[i + 1] for i in range(0, len(padded), 2))
+    return array("H", cells).tobytes()
+
+
+# PUBLIC_INTERFACE
+def unpack_moves(packed: bytes, size: int) -> List[int]:
+    """Inverse of pack_moves()."""
+    if size * size < NIBBLE_PAD:
+        cells = [nibble for byte in packed for nibble in (byte >> 4, byte & 0xF)]
+        return cells[:-1] if cells and cells[-1] == NIBBLE_PAD else cells
+    out = array("H")
+    out.frombytes(packed)
+    return out.tolist()
+
+
+# PUBLIC_INTERFACE
+class ArchivedGame:
+    """Compact, read-only record of a finished game.
+
+    Holds what /game_history and /game_state need: players, timestamps as epoch
+    microseconds, the result and the packed move list. Symbols alternate X, O from
+    the first move, so the board can be redrawn from the cells alone.
+    """
+    __slots__ = ("id", "players", "is_ai", "size", "k", "created_at", "completed_at", "winner", "moves")
+
+    def __init__(self, game_id: int, players: Tuple[str, ...], is_ai: bool, size: int, k: int,
+                 created_at: Optional[int], completed_at: Optional[int], winner: Optional[str], moves: bytes):
+        self.id = game_id
+        self.players = players
+        self.is_ai = is_ai
+        self.size = size
+        self.k = k
+        self.created_at = created_at
+        self.completed_at = completed_at
+        self.winner = winner
+        self.moves = moves
+
+    # PUBLIC_INTERFACE
+    @classmethod
+    def from_session(cls, session: GameSession) -> "ArchivedGame":
+        """Archive a finished live session."""
+        return cls(
+            session.id, session.players, session.is_ai, session.size, session.game.k,
+            session.created_at, session.completed_at, session.winner, pack_moves(session.moves, session.size),
+        )
+
+    @property
+    def moves_count(self) -> int:
+        return len(self.cells())
+
+    # PUBLIC_INTERFACE
+    def cells(self) -> List[int]:
+        return unpack_moves(self.moves, self.size)
+
+    # PUBLIC_INTERFACE
+    def serialize_board(self) -> List[List[Optional[str]]]:
+        board: List[List[Optional[str]]] = [[None] * self.size for _ in range(self.size)]
+        for i, cell in enumerate(self.cells()):
+            board[cell // self.size][cell % self.size] = "X" if i % 2 == 0 else "O"
+        return board
+
+
+# PUBLIC_INTERFACE
+class ArchiveCache:
+    """Bounded LRU of ArchivedGame records by game id.
+
+    Only a cache: finished games are in storage, and a miss rebuilds the
+    record from there (main.load_session). The least recently used entry is
+    dropped beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, ArchivedGame]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._entries
+
+    # PUBLIC_INTERFACE
+    def get(self, game_id: int) -> Optional[ArchivedGame]:
+        archived = self._entries.get(game_id)
+        if archived is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(game_id)
+        self.hits += 1
+        return archived
+
+    # PUBLIC_INTERFACE
+    def put(self, archived: ArchivedGame) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[archived.id] = archived
+        self._entries.move_to_end(archived.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits,
+                "misses": self.misses}
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+# PUBLIC_INTERFACE
+class TokenCache:
+    """Bounded LRU of verified JWTs -> user records, so repeat requests skip the HMAC check.
+
+    An entry lives until the earlier of the token's own `exp` and `ttl`
+    seconds after it was verified, and the least recently used entry is
+    dropped beyond `max_entries` (0 disables caching). revoke() is the hook
+    for logout or compromised tokens: it evicts the token and denies it until
+    its `exp`, even on the uncached path. revoke_user() evicts every cached
+    token of a user, e.g. after a password change, so they are re-verified.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()  # token: (user, expires_at)
+        self._revoked: Dict[str, float] = {}  # token: its exp
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # PUBLIC_INTERFACE
+    def get(self, token: str) -> Optional[dict]:
+        """The cached user for a still-valid token, else None."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                if time.time() < entry[1]:
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+    # PUBLIC_INTERFACE
+    def put(self, token: str, user: dict, exp: float) -> None:
+        """Remember a token that just passed verification; `exp` is its claim, in epoch seconds."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (user, min(exp, time.time() + self.ttl))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # PUBLIC_INTERFACE
+    def revoke(self, token: str, exp: float) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+            now = time.time()
+            # Revoked tokens expire on their own; forget them once they have.
+            self._revoked = {t: e for t, e in self._revoked.items() if e > now}
+            self._revoked[token] = exp
+
+    # PUBLIC_INTERFACE
+    def is_revoked(self, token: str) -> bool:
+        exp = self._revoked.get(token)
+        return exp is not None and exp > time.time()
+
+    # PUBLIC_INTERFACE
+    def revoke_user(self, email: str) -> None:
+        """Drop cached entries for a user so their tokens are verified (and the user reloaded) again."""
+        with self._lock:
+            for token in [t for t, (user, _) in self._entries.items() if user["email"] == email]:
+                del self._entries[token]
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "revoked": len(self._revoked),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,55 @@
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+# Boards are rows of an (M, 9) int8 array, cells row-major, using the same
+# digits as ai_table's base-3 codes: 0 empty, 1 X, 2 O.
+EMPTY, X, O = 0, 1, 2
+NO_WINNER = 0
+
+# The 8 winning lines as cell indices: rows, columns, diagonals.
+LINE_INDICES = np.array(
+    [[0, 1, 2], [3, 4, 5], [6, 7, 8],
+     [0, 3, 6], [1, 4, 7], [2, 5, 8],
+     [0, 4, 8], [2, 4, 6]],
+    dtype=np.intp,
+)
+
+
+# PUBLIC_INTERFACE
+class BatchEvaluation(NamedTuple):
+    winners: np.ndarray  # (M,) int8: NO_WINNER, X or O
+    draws: np.ndarray  # (M,) bool: full board and no winner
+    legal_moves: np.ndarray  # (M, 9) bool: empty cell in a game that is not over
+
+
+# PUBLIC_INTERFACE
+def encode_boards(boards: Iterable[List[List[Optional[str]]]], x: str = "X", o: str = "O") -> np.ndarray:
+    """Convert serialize_board()-style boards to an (M, 9) int8 array."""
+    digits = {None: EMPTY, x: X, o: O}
+    return np.array([[digits[cell] for row in board for cell in row] for board in boards], dtype=np.int8).reshape(-1, 9)
+
+
+# PUBLIC_INTERFACE
+def winners(boards: np.ndarray) -> np.ndarray:
+    """Winner of every board, as an (M,) int8 array. X is reported if both sides have a line."""
+    lines = boards[:, LINE_INDICES]  # gather: (M, 8, 3)
+    x_wins = (lines == X).all(axis=2).any(axis=1)
+    o_wins = (lines == O).all(axis=2).any(axis=1)
+    out = np.zeros(len(boards), dtype=np.int8)
+    out[o_wins] = O
+    out[x_wins] = X
+    return out
+
+
+# PUBLIC_INTERFACE
+def evaluate(boards: np.ndarray) -> BatchEvaluation:
+    """Winners, draw flags and legal-move masks for an (M, 9) int8 array of boards."""
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError(f"Expected an (M, 9) array of boards, got shape {boards.shape}")
+    won = winners(boards)
+    empty = boards == EMPTY
+    ongoing = won == NO_WINNER
+    draws = ongoing & ~empty.any(axis=1)
+    return BatchEvaluation(won, draws, empty & ongoing[:, None])
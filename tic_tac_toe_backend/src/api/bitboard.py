@@ -0,0 +1,140 @@
+from typing import List, Optional, Tuple
+
+from .core import INVALID_MOVE, MoveResult
+
+# Cells are numbered row-major: index = row * 3 + col, bit i set = cell i taken.
+BOARD_SIZE = 3
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+FULL_MASK = (1 << CELL_COUNT) - 1
+
+
+def _line_mask(cells: Tuple[Tuple[int, int], ...]) -> int:
+    mask = 0
+    for row, col in cells:
+        mask |= 1 << (row * BOARD_SIZE + col)
+    return mask
+
+
+# Precomputed once: 3 rows, 3 columns, 2 diagonals.
+WIN_MASKS: Tuple[int, ...] = (
+    tuple(_line_mask(tuple((r, c) for c in range(BOARD_SIZE))) for r in range(BOARD_SIZE))
+    + tuple(_line_mask(tuple((r, c) for r in range(BOARD_SIZE))) for c in range(BOARD_SIZE))
+    + (
+        _line_mask(tuple((i, i) for i in range(BOARD_SIZE))),
+        _line_mask(tuple((i, BOARD_SIZE - 1 - i) for i in range(BOARD_SIZE))),
+    )
+)
+
+# For each cell, only the win lines passing through it (2 to 4 masks).
+CELL_LINES: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(mask for mask in WIN_MASKS if mask >> i & 1) for i in range(CELL_COUNT)
+)
+
+
+# PUBLIC_INTERFACE
+def cell_index(row: int, col: int) -> int:
+    """Map (row, col) to the bit position used by the bitboard."""
+    return row * BOARD_SIZE + col
+
+
+# PUBLIC_INTERFACE
+def has_win(bits: int) -> bool:
+    """True if the given 9-bit mask covers any winning line."""
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+# PUBLIC_INTERFACE
+class BitboardGame:
+    """Tic Tac Toe engine backed by two 9-bit integers, one per side.
+
+    Drop-in replacement for a classic 3x3 core.TicTacToeGame: same constructor,
+    methods and serialize_board() output.
+    """
+
+    __slots__ = ("x_bits", "o_bits", "player_x", "player_o", "current", "move_count", "winner")
+    size = BOARD_SIZE
+    k = BOARD_SIZE
+
+    def __init__(self, board: Optional[List[List[Optional[str]]]] = None, player_x: str = "X", player_o: str = "O"):
+        self.x_bits = 0
+        self.o_bits = 0
+        self.player_x = player_x
+        self.player_o = player_o
+        self.current: str = self.player_x
+        if board is not None:
+            for r in range(BOARD_SIZE):
+                for c in range(BOARD_SIZE):
+                    if board[r][c] == player_x:
+                        self.x_bits |= 1 << cell_index(r, c)
+                    elif board[r][c] == player_o:
+                        self.o_bits |= 1 << cell_index(r, c)
+        self.move_count = bin(self.x_bits | self.o_bits).count("1")
+        self.winner: Optional[str] = self._scan_winner()
+
+    @property
+    def board(self) -> List[List[Optional[str]]]:
+        """List-of-lists view, for code written against TicTacToeGame.board."""
+        return self.serialize_board()
+
+    # PUBLIC_INTERFACE
+    def make_move(self, row: int, col: int, player: str) -> MoveResult:
+        """Attempt to mark the board. Returns a MoveResult, truthy if successful.
+
+        Only the win lines through the played cell are tested.
+        """
+        if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
+            return INVALID_MOVE
+        idx = cell_index(row, col)
+        bit = 1 << idx
+        if (self.x_bits | self.o_bits) & bit or player != self.current or self.winner:
+            return INVALID_MOVE
+        if player == self.player_x:
+            self.x_bits |= bit
+            bits = self.x_bits
+            self.current = self.player_o
+        else:
+            self.o_bits |= bit
+            bits = self.o_bits
+            self.current = self.player_x
+        self.move_count += 1
+        for mask in CELL_LINES[idx]:
+            if bits & mask == mask:
+                self.winner = player
+                return MoveResult(True, winner=player)
+        return MoveResult(True, draw=self.move_count == CELL_COUNT)
+
+    def _scan_winner(self) -> Optional[str]:
+        """Full-board scan, used only when starting from an arbitrary board."""
+        if has_win(self.x_bits):
+            return self.player_x
+        if has_win(self.o_bits):
+            return self.player_o
+        return None
+
+    # PUBLIC_INTERFACE
+    def check_winner(self) -> Optional[str]:
+        """Returns 'X', 'O', or None."""
+        return self.winner
+
+    # PUBLIC_INTERFACE
+    def is_draw(self) -> bool:
+        return self.move_count == CELL_COUNT and not self.winner
+
+    # PUBLIC_INTERFACE
+    def serialize_board(self) -> List[List[Optional[str]]]:
+        board: List[List[Optional[str]]] = []
+        for r in range(BOARD_SIZE):
+            row: List[Optional[str]] = []
+            for c in range(BOARD_SIZE):
+                bit = 1 << cell_index(r, c)
+                if self.x_bits & bit:
+                    row.append(self.player_x)
+                elif self.o_bits & bit:
+                    row.append(self.player_o)
+                else:
+                    row.append(None)
+            board.append(row)
+        return board
@@ -0,0 +1,134 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Set, Union
+
+from fastapi import WebSocket
+
+Frame = Union[str, bytes]
+
+
+# PUBLIC_INTERFACE
+class Subscriber:
+    """One WebSocket's outbound side: a bounded queue drained by its own sender task.
+
+    Every frame for the socket goes through push(), so sends never
+    interleave. Game updates are deltas, so a full queue can't just lose
+    one: everything queued is dropped instead and replaced by a resync
+    marker. The sender awaits `snapshot()` for a full state when it gets
+    there, so the state includes the frame being pushed and anything after.
+    """
+
+    __slots__ = ("websocket", "codec", "queue", "task", "snapshot", "dropped")
+
+    def __init__(self, websocket: WebSocket, queue_size: int, snapshot: Callable[[], Awaitable[Frame]],
+                 codec: str):
+        self.websocket = websocket
+        self.codec = codec
+        self.queue: "asyncio.Queue[Optional[Frame]]" = asyncio.Queue(queue_size)  # None: send a snapshot
+        self.snapshot = snapshot
+        self.task = asyncio.create_task(self._send_loop())
+        self.dropped = 0
+
+    # PUBLIC_INTERFACE
+    def push(self, frame: Optional[Frame]) -> int:
+        """Queue a frame without waiting; returns how many frames were dropped to resync instead."""
+        if not self.queue.full():
+            self.queue.put_nowait(frame)
+            return 0
+        dropped = self.queue.qsize() + 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+        self.dropped += dropped
+        return dropped
+
+    # PUBLIC_INTERFACE
+    def resync(self) -> None:
+        """Queue a full state, built when the sender reaches it."""
+        self.push(None)
+
+    async def _send_loop(self) -> None:
+        try:
+            while True:
+                frame = await self.queue.get()
+                if frame is None:
+                    frame = await self.snapshot()
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            pass  # socket gone; the endpoint's receive loop notices and unsubscribes
+
+    # PUBLIC_INTERFACE
+    async def close(self) -> None:
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+
+# PUBLIC_INTERFACE
+class GameBroadcaster:
+    """Registry of WebSockets subscribed to each game, with fan-out of encoded frames.
+
+    publish() only enqueues, so one slow client never delays the others or
+    the request that made the move.
+    """
+
+    def __init__(self, queue_size: int = 16):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    # PUBLIC_INTERFACE
+    def subscribe(self, game_id: int, websocket: WebSocket, snapshot: Callable[[], Awaitable[Frame]],
+                  codec: str = "json") -> Subscriber:
+        """Register a socket; `snapshot` encodes the game's full current state, in `codec`, for resyncs."""
+        subscriber = Subscriber(websocket, self.queue_size, snapshot, codec)
+        self._subscribers.setdefault(game_id, set()).add(subscriber)
+        return subscriber
+
+    # PUBLIC_INTERFACE
+    async def unsubscribe(self, game_id: int, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(game_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[game_id]
+        await subscriber.close()
+
+    # PUBLIC_INTERFACE
+    def publish(self, game_id: int, encode: Callable[[str], Frame]) -> int:
+        """Queue a frame for every subscriber of the game; returns how many.
+
+        encode(codec) is called at most once per codec in use, so a frame is
+        never serialized per socket, nor at all for games nobody watches.
+        """
+        subscribers = self._subscribers.get(game_id, ())
+        frames: Dict[str, Frame] = {}
+        for subscriber in subscribers:
+            frame = frames.get(subscriber.codec)
+            if frame is None:
+                frame = frames[subscriber.codec] = encode(subscriber.codec)
+            self.dropped += subscriber.push(frame)
+        self.published += 1
+        self.delivered += len(subscribers)
+        return len(subscribers)
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        subscribers = [s for subs in self._subscribers.values() for s in subs]
+        return {
+            "games": len(self._subscribers),
+            "subscribers": len(subscribers),
+            "queue_size": self.queue_size,
+            "queued": sum(s.queue.qsize() for s in subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,275 @@
+import asyncio
+import fcntl
+import json
+import os
+import struct
+from abc import ABC, abstractmethod
+from typing import Callable, List, NamedTuple, Optional, Set, Tuple
+
+from .events import GameEvent
+
+_LENGTH = struct.Struct("!I")  # frames on the Unix socket: length, then an encode_update() payload
+
+
+# PUBLIC_INTERFACE
+class GameUpdate(NamedTuple):
+    """What one accepted move request did to a game, self-contained so any worker can fan it out."""
+    game_id: int
+    size: int
+    players: Tuple[str, ...]
+    moves: List[Tuple[int, int, str]]  # (row, col, symbol), the player's then the AI's reply
+    winner: Optional[str]
+    draw: bool
+    next_turn: Optional[str]
+    events: List[GameEvent]  # the log entries written, for workers holding the game in memory
+
+
+# PUBLIC_INTERFACE
+def encode_update(update: GameUpdate) -> bytes:
+    events = [(e.seq, e.kind, e.data) for e in update.events]
+    return json.dumps([update.game_id, update.size, update.players, update.moves, update.winner, update.draw,
+                       update.next_turn, events], separators=(",", ":")).encode()
+
+
+# PUBLIC_INTERFACE
+def decode_update(raw: bytes) -> GameUpdate:
+    game_id, size, players, moves, winner, draw, next_turn, events = json.loads(raw)
+    return GameUpdate(game_id, size, tuple(players), [tuple(m) for m in moves], winner, draw, next_turn,
+                      [GameEvent(game_id, seq, kind, data) for seq, kind, data in events])
+
+
+Handler = Callable[[GameUpdate, bool], None]  # (update, True if it came from another worker)
+
+
+# PUBLIC_INTERFACE
+class MessageBus(ABC):
+    """Carries GameUpdates to the subscribed handlers of every worker, the publishing one included.
+
+    publish() never waits: local handlers run immediately, and remote
+    delivery is best effort.
+    """
+
+    def __init__(self):
+        self._handlers: List[Handler] = []
+        self.published = 0
+        self.received = 0  # from other workers
+        self.handler_errors = 0
+
+    # PUBLIC_INTERFACE
+    def subscribe(self, handler: Handler) -> None:
+        self._handlers.append(handler)
+
+    def _deliver(self, update: GameUpdate, remote: bool) -> None:
+        """Run every handler; one that raises is counted and skipped, so it can't stop the others or the bus."""
+        for handler in self._handlers:
+            try:
+                handler(update, remote)
+            except Exception:
+                self.handler_errors += 1
+
+    # PUBLIC_INTERFACE
+    async def start(self) -> None:
+        pass
+
+    # PUBLIC_INTERFACE
+    async def stop(self) -> None:
+        pass
+
+    # PUBLIC_INTERFACE
+    @abstractmethod
+    def publish(self, update: GameUpdate) -> None:
+        ...
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {"published": self.published, "received": self.received, "handler_errors": self.handler_errors}
+
+
+# PUBLIC_INTERFACE
+class InProcessBus(MessageBus):
+    """Single-worker bus: a direct call to the handlers."""
+
+    def publish(self, update: GameUpdate) -> None:
+        self.published += 1
+        self._deliver(update, False)
+
+
+# PUBLIC_INTERFACE
+class BusRelay:
+    """Stand-in broker for UnixSocketBus: forwards each frame to every other connection.
+
+    Only the holder of `path`.lock may listen, so workers racing to host it
+    can't unlink each other's socket. A peer whose send buffer is over
+    `max_buffer` misses frames rather than holding everyone up.
+    """
+
+    def __init__(self, path: str, max_buffer: int):
+        self.path = path
+        self.max_buffer = max_buffer
+        self._lock_fd: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set[asyncio.Task] = set()
+        self.relayed = 0
+        self.dropped = 0
+
+    # PUBLIC_INTERFACE
+    async def start(self) -> bool:
+        """Take the lock and listen; False if another process hosts the relay."""
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # left by a host that died
+        self._server = await asyncio.start_unix_server(self._serve, self.path)
+        return True
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._peers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                header = await reader.readexactly(_LENGTH.size)
+                frame = header + await reader.readexactly(_LENGTH.unpack(header)[0])
+                for peer in self._peers:
+                    if peer is writer:
+                        continue
+                    if peer.transport.get_write_buffer_size() > self.max_buffer:
+                        self.dropped += 1
+                    else:
+                        peer.write(frame)
+                        self.relayed += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    # PUBLIC_INTERFACE
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for peer in list(self._peers):
+                peer.close()  # each handler then sees EOF and returns
+            if self._handlers:
+                await asyncio.wait(self._handlers, timeout=1.0)
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+# PUBLIC_INTERFACE
+class UnixSocketBus(MessageBus):
+    """Bus across the worker processes on one host, through a BusRelay on a Unix socket.
+
+    Whichever worker first gets the relay's lock hosts it, and every worker,
+    that one included, connects to it as a client. If the host exits, the
+    others reconnect and one of them takes over. Updates published while a
+    worker is disconnected, or while its socket buffer is over `max_buffer`,
+    reach only its own handlers.
+    """
+
+    def __init__(self, path: str, max_buffer: int = 1 << 20, retry_interval: float = 0.1):
+        super().__init__()
+        self.path = path
+        self.max_buffer = max_buffer
+        self.retry_interval = retry_interval
+        self._relay: Optional[BusRelay] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.reconnects = 0
+
+    # PUBLIC_INTERFACE
+    async def start(self, timeout: float = 2.0) -> None:
+        """Connect (hosting the relay if nobody does); waits up to `timeout` for the first connection."""
+        self._connected = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass  # keeps retrying in the background
+
+    async def _run(self) -> None:
+        while True:
+            if self._relay is None:
+                relay = BusRelay(self.path, self.max_buffer)
+                if await relay.start():
+                    self._relay = relay
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError:
+                await asyncio.sleep(self.retry_interval)
+                continue
+            self._writer = writer
+            self._connected.set()
+            try:
+                while True:
+                    header = await reader.readexactly(_LENGTH.size)
+                    raw = await reader.readexactly(_LENGTH.unpack(header)[0])
+                    self.received += 1
+                    self._deliver(decode_update(raw), True)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                self._writer = None
+                self._connected.clear()
+                writer.close()
+            self.reconnects += 1
+
+    # PUBLIC_INTERFACE
+    def publish(self, update: GameUpdate) -> None:
+        self.published += 1
+        self._deliver(update, False)
+        writer = self._writer
+        if writer is None or writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.dropped += 1
+            return
+        raw = encode_update(update)
+        writer.write(_LENGTH.pack(len(raw)) + raw)
+
+    # PUBLIC_INTERFACE
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._relay is not None:
+            await self._relay.stop()
+            self._relay = None
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        metrics = super().metrics()
+        metrics.update({
+            "connected": self._writer is not None,
+            "hosting_relay": self._relay is not None,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        })
+        if self._relay is not None:
+            metrics.update({"relayed": self._relay.relayed, "relay_dropped": self._relay.dropped})
+        return metrics
+
+
+# PUBLIC_INTERFACE
+def create_bus(backend: str = "memory", path: str = "/tmp/tictactoe-bus.sock") -> MessageBus:
+    """Build the configured message bus."""
+    if backend == "memory":
+        return InProcessBus()
+    if backend == "unix":
+        return UnixSocketBus(path)
+    raise ValueError(f"Unknown message bus: {backend}")
@@ -1,66 +1,158 @@
 from typing import List, Optional
 
+
+# PUBLIC_INTERFACE
+class MoveResult:
+    """Outcome of a make_move call. Truthy if the move was accepted."""
+
+    __slots__ = ("ok", "winner", "draw")
+
+    def __init__(self, ok: bool, winner: Optional[str] = None, draw: bool = False):
+        self.ok = ok
+        self.winner = winner
+        self.draw = draw
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @property
+    def finished(self) -> bool:
+        return self.winner is not None or self.draw
+
+
+INVALID_MOVE = MoveResult(False)
+
+
+# Directions counted outward from the last move: row, column, diagonal, anti-diagonal.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
 class TicTacToeGame:
-    """Core game logic for Tic Tac Toe."""
+    """Core game logic for Tic Tac Toe on a size x size board, k in a row to win.
+
+    Defaults to classic 3x3 / 3 in a row; e.g. size=15, k=5 for gomoku.
+    """
 
-    def __init__(self, board: Optional[List[List[Optional[str]]]] = None, player_x: str = "X", player_o: str = "O"):
+    def __init__(self, board: Optional[List[List[Optional[str]]]] = None, player_x: str = "X", player_o: str = "O",
+                 size: int = 3, k: int = 3):
         if board is None:
-            self.board = [[None for _ in range(3)] for _ in range(3)]
+            self.board = [[None for _ in range(size)] for _ in range(size)]
         else:
             self.board = [row[:] for row in board]
+            size = len(board)
+        if not 1 <= k <= size:
+            raise ValueError(f"k must be between 1 and the board size ({size}), got {k}")
+        self.size = size
+        self.k = k
         self.player_x = player_x
         self.player_o = player_o
         self.current: str = self.player_x
+        # Status is kept up to date by make_move; a full scan only happens here.
+        self.move_count = sum(1 for row in self.board for cell in row if cell)
+        self.winner: Optional[str] = self._scan_winner()
+
+    def _run_length(self, row: int, col: int, dr: int, dc: int, player: str) -> int:
+        """Length of player's run through (row, col) along one direction, capped at k."""
+        b, n, k = self.board, self.size, self.k
+        run = 1
+        for sign in (1, -1):
+            r, c = row + sign * dr, col + sign * dc
+            while run < k and 0 <= r < n and 0 <= c < n and b[r][c] == player:
+                run += 1
+                r += sign * dr
+                c += sign * dc
+        return run
 
     # PUBLIC_INTERFACE
-    def make_move(self, row: int, col: int, player: str) -> bool:
-        """Attempt to mark the board. Returns True if successful."""
-        if self.board[row][col] is None and player == self.current:
-            self.board[row][col] = player
-            self.current = self.player_o if player == self.player_x else self.player_x
-            return True
-        return False
+    def make_move(self, row: int, col: int, player: str) -> MoveResult:
+        """Attempt to mark the board. Returns a MoveResult, truthy if successful.
+
+        Only runs through (row, col) are counted, in four directions and at most
+        k - 1 cells each way, so a move costs O(k) regardless of board size.
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return INVALID_MOVE
+        if self.board[row][col] is not None or player != self.current or self.winner:
+            return INVALID_MOVE
+        self.board[row][col] = player
+        self.move_count += 1
+        self.current = self.player_o if player == self.player_x else self.player_x
+        for dr, dc in DIRECTIONS:
+            if self._run_length(row, col, dr, dc, player) >= self.k:
+                self.winner = player
+                return MoveResult(True, winner=player)
+        return MoveResult(True, draw=self.move_count == self.size * self.size)
+
+    def _scan_winner(self) -> Optional[str]:
+        """Full-board scan, used only when starting from an arbitrary board."""
+        for r in range(self.size):
+            for c in range(self.size):
+                player = self.board[r][c]
+                if player and any(self._run_length(r, c, dr, dc, player) >= self.k for dr, dc in DIRECTIONS):
+                    return player
+        return None
 
     # PUBLIC_INTERFACE
     def check_winner(self) -> Optional[str]:
-        """Checks for a winner. Returns 'X', 'O', or None."""
-        lines = []
-        # Rows and columns
-        for i in range(3):
-            lines.append(self.board[i])
-            lines.append([self.board[0][i], self.board[1][i], self.board[2][i]])
-        # Diagonals
-        lines.append([self.board[0][0], self.board[1][1], self.board[2][2]])
-        lines.append([self.board[0][2], self.board[1][1], self.board[2][0]])
-        for line in lines:
-            if line[0] and line[0] == line[1] == line[2]:
-                return line[0]
-        return None
+        """Returns 'X', 'O', or None."""
+        return self.winner
 
     # PUBLIC_INTERFACE
     def is_draw(self) -> bool:
-        return all(cell for row in self.board for cell in row) and not self.check_winner()
+        return self.move_count == self.size * self.size and not self.winner
 
     # PUBLIC_INTERFACE
     def serialize_board(self) -> List[List[Optional[str]]]:
         return [row[:] for row in self.board]
 
 
+AI_MODES = ("naive", "perfect", "search", "mcts")
+# Full-depth search is only practical on 3x3; larger boards search this many plies.
+LARGE_BOARD_SEARCH_DEPTH = 2
+
+
 # PUBLIC_INTERFACE
-def ai_move(board: List[List[Optional[str]]], symbol: str) -> (int, int):
-    """Naive AI: picks the first available cell (can be replaced with better AI)."""
-    for i in range(3):
-        for j in range(3):
+def ai_move(board: List[List[Optional[str]]], symbol: str, mode: str = "naive", k: Optional[int] = None,
+            engine=None) -> (int, int):
+    """Pick a move for `symbol`. k is the win length (defaults to the board size).
+
+    Modes:
+        naive: first available cell.
+        perfect: O(1) lookup in the precomputed table of every reachable position
+            (classic 3x3 only; other variants fall back to naive).
+        search: alpha-beta negamax with the process-wide transposition table.
+        mcts: Monte Carlo Tree Search. Pass the game's mcts.MCTSEngine as
+            `engine` to reuse its tree between moves.
+    """
+    size = len(board)
+    k = k or size
+    if mode == "mcts":
+        if engine is None:
+            from .mcts import MCTSEngine
+
+            engine = MCTSEngine(size, k)
+        row, col = engine.choose_for_board(board, symbol)
+        if row != -1:
+            return row, col
+    elif mode == "perfect":
+        if size == 3 and k == 3:
+            from .ai_table import best_move_for_board
+
+            row, col = best_move_for_board(board, symbol)
+            if row != -1:
+                return row, col
+    elif mode == "search":
+        from .search import search_board
+
+        depth = None if size == 3 else LARGE_BOARD_SEARCH_DEPTH
+        (row, col), _ = search_board(board, symbol, k, depth)
+        if row != -1:
+            return row, col
+    elif mode not in AI_MODES:
+        raise ValueError(f"Unknown AI mode: {mode}")
+    for i in range(size):
+        for j in range(size):
             if board[i][j] is None:
                 return i, j
     return -1, -1  # Should not happen
 
-
-# PUBLIC_INTERFACE
-def get_leaderboard_stub() -> List[dict]:
-    """Stub: Replace with DB logic."""
-    return [
-        {"username": "alice", "wins": 10, "losses": 2, "draws": 5, "games_played": 17},
-        {"username": "bob", "wins": 7, "losses": 4, "draws": 3, "games_played": 14},
-        {"username": "carol", "wins": 4, "losses": 9, "draws": 2, "games_played": 15},
-    ]
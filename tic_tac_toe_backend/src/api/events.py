@@ -0,0 +1,94 @@
+from array import array
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+
+from .archive import to_epoch_us
+from .bitboard import BitboardGame
+from .core import MoveResult, TicTacToeGame
+from .session import GameSession
+
+# Every game is an append-only log of these, numbered from seq 0 (CREATED).
+CREATED = "created"
+MOVE = "move"
+AI_MOVE = "ai_move"
+FINISHED = "finished"
+EVENT_KINDS = (CREATED, MOVE, AI_MOVE, FINISHED)
+
+
+# PUBLIC_INTERFACE
+class GameEvent(NamedTuple):
+    """One entry in a game's log. `data` must be JSON-serialisable.
+
+    created: players, is_ai, size, k, created_at
+    move / ai_move: player, row, col, symbol
+    finished: winner, completed_at
+    """
+    game_id: int
+    seq: int
+    kind: str
+    data: dict
+
+
+# PUBLIC_INTERFACE
+def apply_event(session: GameSession, event: GameEvent) -> Optional[MoveResult]:
+    """Fold one event into a live session.
+
+    Used both for new events and when replaying stored ones. A rejected move
+    leaves the session untouched (including its seq) and returns a falsy MoveResult.
+    """
+    result = None
+    if event.kind in (MOVE, AI_MOVE):
+        d = event.data
+        result = session.game.make_move(d["row"], d["col"], d["symbol"])
+        if not result:
+            return result
+        session.add_move(d["row"], d["col"])
+        if result.winner:
+            session.winner = result.winner
+    elif event.kind == FINISHED:
+        session.winner = event.data["winner"]
+        session.completed_at = to_epoch_us(datetime.fromisoformat(event.data["completed_at"]))
+    session.seq = event.seq + 1
+    return result
+
+
+# PUBLIC_INTERFACE
+def take_snapshot(session: GameSession) -> dict:
+    """JSON-serialisable state of a session after its first `seq` events."""
+    return {
+        "seq": session.seq,
+        "board": session.game.serialize_board(),
+        "current": session.game.current,
+        "cells": session.moves.tolist(),
+        "winner": session.winner,
+        "completed_at": session.completed_at,
+    }
+
+
+# PUBLIC_INTERFACE
+def restore_snapshot(session: GameSession, snapshot: dict) -> None:
+    """Load a take_snapshot() result into a freshly created session."""
+    old = session.game
+    if isinstance(old, BitboardGame):
+        game = BitboardGame(snapshot["board"])
+    else:
+        game = TicTacToeGame(snapshot["board"], k=old.k)
+    game.current = snapshot["current"]
+    session.game = game
+    session.moves = array(session.moves.typecode, snapshot["cells"])
+    session.winner = snapshot["winner"]
+    session.completed_at = snapshot["completed_at"]
+    session.seq = session.snapshot_seq = snapshot["seq"]
+
+
+# PUBLIC_INTERFACE
+def replay(session: GameSession, snapshot: Optional[dict], events: Iterable[GameEvent]) -> GameSession:
+    """Rebuild a session from its latest snapshot (if any) plus the events after it."""
+    if snapshot is not None:
+        restore_snapshot(session, snapshot)
+    for event in events:
+        if event.seq >= session.seq:
+            apply_event(session, event)
+            # Stored events were valid when written; never re-read one that no longer applies.
+            session.seq = event.seq + 1
+    return session
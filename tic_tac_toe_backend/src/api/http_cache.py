@@ -0,0 +1,74 @@
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+# ETags carry a per-process token so two workers at the same version never vouch for each other's bodies.
+BOOT_ID = uuid.uuid4().hex[:8]
+
+
+# PUBLIC_INTERFACE
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value covers `etag` (weak comparison, as RFC 9110 asks for)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+# PUBLIC_INTERFACE
+class VersionedResponseCache:
+    """Serialized response bodies for the current version of some data.
+
+    Callers bump the version whenever the data changes; the first get/put at
+    a new version drops every older body. ETags are derived from the version
+    and key alone, so a matching If-None-Match can be answered without
+    building or even looking up a body.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._version: Optional[int] = None
+        self._bodies: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def _sync(self, version: int) -> None:
+        if version != self._version:
+            self._bodies.clear()
+            self._version = version
+
+    # PUBLIC_INTERFACE
+    def etag(self, version: int, key: Hashable) -> str:
+        return f'"{self.name}-{BOOT_ID}-{version}-{zlib.crc32(repr(key).encode()):08x}"'
+
+    # PUBLIC_INTERFACE
+    def get(self, version: int, key: Hashable) -> Optional[bytes]:
+        self._sync(version)
+        body = self._bodies.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._bodies.move_to_end(key)
+        return body
+
+    # PUBLIC_INTERFACE
+    def put(self, version: int, key: Hashable, body: bytes) -> None:
+        self._sync(version)
+        self._bodies[key] = body
+        if len(self._bodies) > self.max_entries:
+            self._bodies.popitem(last=False)
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {
+            "version": self._version,
+            "entries": len(self._bodies),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
@@ -0,0 +1,217 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .events import GameEvent
+from .storage import DuplicateEventError, StorageBackend
+
+# Errors no retry can fix: the data itself is refused. Anything else is assumed transient.
+REJECTED_ERRORS = (DuplicateEventError, TypeError, ValueError)
+
+
+# PUBLIC_INTERFACE
+class EventJournal:
+    """Write-behind buffer between the game endpoints and the storage backend.
+
+    Events are queued in memory and a background task writes them in batches
+    every `flush_interval` seconds, or as soon as `batch_size` events are
+    waiting. At most `max_pending` events are ever unwritten: append() waits for
+    a flush once the queue is that long. A crash therefore loses no more than
+    max_pending events (in practice, the last flush_interval's worth); a normal
+    shutdown via stop() writes everything.
+
+    Snapshots ride along with the events: only the latest one per game is
+    kept, and it is written in the same storage call as the events it covers,
+    so a stored snapshot never runs ahead of its game's stored log.
+
+    A batch that fails with one of REJECTED_ERRORS (a duplicate (game_id, seq),
+    data that won't serialize) is retried event by event. An event storage
+    refuses is dropped and counted in `rejected`, and so is everything after
+    it for the same game, queued events and snapshot included; the game id
+    goes to `on_refused` so the caller can rebuild its copy from storage.
+    Other failures leave the batch queued for the next flush.
+    """
+
+    def __init__(self, storage: StorageBackend, flush_interval: float = 0.05, batch_size: int = 500,
+                 max_pending: int = 10_000, on_refused: Optional[Callable[[int], None]] = None):
+        self.storage = storage
+        self.on_refused = on_refused
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._queue: Deque[GameEvent] = deque()
+        self._snapshots: Dict[int, dict] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushed = 0
+        self.snapshots_written = 0
+        self.rejected = 0  # events storage refused outright
+        self.rejected_snapshots = 0
+        self.batches = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self._total_flush_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    # PUBLIC_INTERFACE
+    async def start(self) -> None:
+        """Start the background flusher (idempotent)."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+
+    # PUBLIC_INTERFACE
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.drain()
+
+    # PUBLIC_INTERFACE
+    async def drain(self) -> None:
+        """Write everything queued so far, in as many batches as it takes."""
+        while self._queue or self._snapshots:
+            await self.flush()
+
+    # PUBLIC_INTERFACE
+    async def append(self, event: GameEvent, snapshot: Optional[dict] = None, stored: bool = False) -> None:
+        """Queue an event, plus the game's snapshot taken right after it.
+
+        With stored=True the caller already wrote the event, and only the
+        snapshot is queued. Only waits on I/O when max_pending events are
+        already queued.
+        """
+        await self.start()
+        if not stored:
+            self._queue.append(event)
+        if snapshot is not None:
+            self._snapshots[event.game_id] = dict(snapshot, game_id=event.game_id)
+        if len(self._queue) >= self.max_pending:
+            await self.flush()
+        elif len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    # PUBLIC_INTERFACE
+    async def flush(self) -> None:
+        """Write up to batch_size queued events, and the snapshots they cover, in one storage call."""
+        async with self._flush_lock:
+            if not self._queue and not self._snapshots:
+                return
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            # Hold back snapshots whose game still has events queued behind this batch.
+            waiting = {event.game_id for event in self._queue}
+            snapshots = [s for gid, s in self._snapshots.items() if gid not in waiting]
+            for snapshot in snapshots:
+                del self._snapshots[snapshot["game_id"]]
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self.storage.write_events, batch, snapshots)
+            except REJECTED_ERRORS:
+                batch, snapshots = await self._salvage(batch, snapshots)
+            except Exception:
+                self._requeue(batch, snapshots)
+                raise
+            elapsed = time.perf_counter() - start
+            self.flushed += len(batch)
+            self.snapshots_written += len(snapshots)
+            self.batches += 1
+            self.last_flush_seconds = elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+            self._total_flush_seconds += elapsed
+
+    def _requeue(self, events: List[GameEvent], snapshots: List[dict]) -> None:
+        """Put unwritten work back at the front so the next flush retries it; newer snapshots win."""
+        self._queue.extendleft(reversed(events))
+        for snapshot in snapshots:
+            self._snapshots.setdefault(snapshot["game_id"], snapshot)
+
+    async def _salvage(self, batch: List[GameEvent], snapshots: List[dict]
+                       ) -> Tuple[List[GameEvent], List[dict]]:
+        """Write a rejected batch one event at a time, dropping what storage refuses; returns what was written."""
+        written: List[GameEvent] = []
+        refused: Set[int] = set()
+        for i, event in enumerate(batch):
+            if event.game_id in refused:
+                self.rejected += 1
+                continue
+            try:
+                await asyncio.to_thread(self.storage.write_events, [event], [])
+            except REJECTED_ERRORS:
+                refused.add(event.game_id)
+                self.rejected += 1
+            except Exception:
+                self._requeue([e for e in batch[i:] if e.game_id not in refused],
+                              [s for s in snapshots if s["game_id"] not in refused])
+                self._drop_games(refused)
+                raise
+            else:
+                written.append(event)
+        kept = [s for s in snapshots if s["game_id"] not in refused]
+        self.rejected_snapshots += len(snapshots) - len(kept)
+        self._drop_games(refused)
+        if kept:
+            try:
+                await asyncio.to_thread(self.storage.write_events, [], kept)
+            except Exception:
+                self._requeue([], kept)
+                raise
+        return written, kept
+
+    def _drop_games(self, game_ids: Set[int]) -> None:
+        """Forget everything still queued for games with a refused event, and report them to on_refused.
+
+        Writing a game's later events (or a snapshot covering the refused one)
+        would leave a gap in its stored log that replays to a different board.
+        """
+        if not game_ids:
+            return
+        queued = len(self._queue)
+        self._queue = deque(e for e in self._queue if e.game_id not in game_ids)
+        self.rejected += queued - len(self._queue)
+        for game_id in game_ids:
+            if self._snapshots.pop(game_id, None) is not None:
+                self.rejected_snapshots += 1
+            if self.on_refused is not None:
+                self.on_refused(game_id)
+
+    async def _run(self) -> None:
+        while True:
+            # Not wait_for(): it can swallow a cancel that lands as the event is set, and stop() would hang.
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait((waiter,), timeout=self.flush_interval)
+            finally:
+                waiter.cancel()
+            self._wakeup.clear()
+            try:
+                while self._queue or self._snapshots:
+                    await self.flush()
+            except Exception:
+                # Storage hiccup: keep the events queued and retry on the next tick.
+                pass
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {
+            "pending": len(self._queue),
+            "pending_snapshots": len(self._snapshots),
+            "max_pending": self.max_pending,
+            "flushed": self.flushed,
+            "snapshots_written": self.snapshots_written,
+            "rejected": self.rejected,
+            "rejected_snapshots": self.rejected_snapshots,
+            "batches": self.batches,
+            "last_flush_seconds": round(self.last_flush_seconds, 6),
+            "max_flush_seconds": round(self.max_flush_seconds, 6),
+            "avg_flush_seconds": round(self._total_flush_seconds / self.batches, 6) if self.batches else 0.0,
+        }
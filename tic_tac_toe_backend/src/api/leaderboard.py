@@ -0,0 +1,132 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ratings import DEFAULT_K_FACTOR, DEFAULT_RATING, FIXED_RATINGS, batch_elo, elo_update, encode_games, score_for
+from .skiplist import RankedSkipList
+
+NOT_RANKED = ("AI",)  # player names that are not users
+
+
+# PUBLIC_INTERFACE
+class PlayerStats:
+    __slots__ = ("username", "rating", "wins", "losses", "draws")
+
+    def __init__(self, username: str, rating: float = DEFAULT_RATING):
+        self.username = username
+        self.rating = rating
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+
+    @property
+    def games_played(self) -> int:
+        return self.wins + self.losses + self.draws
+
+
+# PUBLIC_INTERFACE
+class Leaderboard:
+    """Per-player Elo ratings and results, kept in rank order as games finish.
+
+    Players are ranked by rating, then wins, then fewest losses, then
+    username. The order lives in a RankedSkipList, so recording a result is
+    O(log n), a page of k players is O(log n + k) and a player's rank is
+    O(log n); nothing ever rescans the games. rebuild() is the exception: it
+    recomputes everything from the full history with ratings.batch_elo(), for
+    startup and for when k_factor changes.
+    """
+
+    def __init__(self, k_factor: float = DEFAULT_K_FACTOR, seed: Optional[int] = None):
+        self.k_factor = k_factor
+        self._stats: Dict[str, PlayerStats] = {}
+        self._ranking = RankedSkipList(seed)
+        self._seed = seed
+        self.version = 0  # bumped on every change, for response caching
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    @staticmethod
+    def sort_key(stats: PlayerStats) -> tuple:
+        return (-stats.rating, -stats.wins, stats.losses, stats.username)
+
+    def _player(self, username: str) -> PlayerStats:
+        """Stats for a player, taken out of the ranking until _rank() puts them back."""
+        stats = self._stats.get(username)
+        if stats is None:
+            stats = self._stats[username] = PlayerStats(username, FIXED_RATINGS.get(username, DEFAULT_RATING))
+        elif username not in NOT_RANKED:
+            self._ranking.remove(self.sort_key(stats))
+        return stats
+
+    def _rank(self, stats: PlayerStats) -> None:
+        if stats.username not in NOT_RANKED:
+            self._ranking.insert(self.sort_key(stats))
+
+    # PUBLIC_INTERFACE
+    def record_result(self, players: Sequence[str], winner: Optional[str]) -> None:
+        """Count a finished game. `winner` is the winning symbol (X is players[0]) or None for a draw."""
+        x = self._player(players[0])
+        o = x if players[1] == players[0] else self._player(players[1])
+        score = score_for(winner)
+        new_x, new_o = elo_update(x.rating, o.rating, score, self.k_factor)
+        if x.username not in FIXED_RATINGS:
+            x.rating = new_x
+        if o.username not in FIXED_RATINGS:
+            o.rating = new_o
+        if winner is None:
+            x.draws += 1
+            o.draws += 1
+        else:
+            won, lost = (x, o) if winner == "X" else (o, x)
+            won.wins += 1
+            lost.losses += 1
+        self._rank(x)
+        if o is not x:
+            self._rank(o)
+        self.version += 1
+
+    # PUBLIC_INTERFACE
+    def rebuild(self, games: Iterable[dict]) -> None:
+        """Reset and recompute ratings and results from every game in `games`, oldest first.
+
+        `games` is as from StorageBackend.finished_games(). Ratings come from
+        ratings.batch_elo(), which matches replaying record_result() game by game.
+        """
+        arrays = encode_games(games)
+        ratings = batch_elo(arrays, self.k_factor)
+        n = len(arrays.names)
+        a, b, score = arrays.a, arrays.b, arrays.score_a
+        x_won, o_won, draw = score == 1.0, score == 0.0, score == 0.5
+        wins = np.bincount(a[x_won], minlength=n) + np.bincount(b[o_won], minlength=n)
+        losses = np.bincount(b[x_won], minlength=n) + np.bincount(a[o_won], minlength=n)
+        draws = np.bincount(a[draw], minlength=n) + np.bincount(b[draw], minlength=n)
+        self._stats = {}
+        self._ranking = RankedSkipList(self._seed)
+        for i, name in enumerate(arrays.names):
+            stats = self._stats[name] = PlayerStats(name, float(ratings[i]))
+            stats.wins, stats.losses, stats.draws = int(wins[i]), int(losses[i]), int(draws[i])
+            self._rank(stats)
+        self.version += 1
+
+    # PUBLIC_INTERFACE
+    def rank(self, username: str) -> Optional[int]:
+        """1-based rank, or None if the player has no finished games."""
+        stats = self._stats.get(username)
+        if stats is None or username in NOT_RANKED:
+            return None
+        return self._ranking.index(self.sort_key(stats)) + 1
+
+    # PUBLIC_INTERFACE
+    def page(self, offset: int = 0, limit: int = 10) -> List[Tuple[int, PlayerStats]]:
+        """(rank, stats) for `limit` players starting at 0-based position `offset`."""
+        keys = self._ranking.slice(offset, limit)
+        return [(offset + i + 1, self._stats[key[-1]]) for i, key in enumerate(keys)]
+
+    # PUBLIC_INTERFACE
+    def around(self, username: str, limit: int = 10) -> List[Tuple[int, PlayerStats]]:
+        """A page of `limit` players with `username` in the middle (empty if unranked)."""
+        rank = self.rank(username)
+        if rank is None:
+            return []
+        return self.page(max(0, rank - 1 - limit // 2), limit)
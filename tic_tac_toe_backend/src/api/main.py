@@ -1,9 +1,11 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from typing import Dict, List, Optional
+from typing import Callable, Counter, Dict, List, Literal, Optional, Tuple, TypeVar, Union
+from pydantic import TypeAdapter, ValidationError
 from starlette.websockets import WebSocketState
 from datetime import datetime, timedelta
+from contextlib import asynccontextmanager
 
 from .models import (
     UserRegisterRequest,
@@ -16,24 +18,114 @@ from .models import (
     GameHistoryItem,
     LeaderboardResponse,
     LeaderboardEntry,
+    PositionStatsEntry,
+    PositionStatsResponse,
+    WSClientFrame,
 )
-from .core import TicTacToeGame, ai_move, get_leaderboard_stub
-
-import hashlib
+from .core import INVALID_MOVE, MoveResult, TicTacToeGame
+from .bitboard import BitboardGame
+from .mcts import MCTSEngine
+from .ai_pool import AIExecutor
+from .user_store import DuplicateUserError
+from .storage import DuplicateEventError, create_storage
+from .journal import EventJournal
+from .events import AI_MOVE, CREATED, FINISHED, MOVE, GameEvent, apply_event, replay, take_snapshot
+from .ai_table import canonical_code, decode
+from .archive import ArchiveCache, ArchivedGame, to_epoch_us
+from .session import GameSession
+from .leaderboard import Leaderboard
+from .http_cache import VersionedResponseCache, etag_matches
+from .auth_cache import TokenCache
+from .reaper import SessionReaper
+from .passwords import DUMMY_HASH, HasherBusyError, PasswordHasher, needs_rehash
+from .broadcast import Frame, GameBroadcaster
+from .wire import BINARY, JSON, SUBPROTOCOL, decode_move, encode_delta, encode_state
+from .bus import GameUpdate, create_bus
+
+import asyncio
+import json
 import jwt
+import os
+import time
+import weakref
 
 SECRET_KEY = "tictactoe-secret"  # For demo purposes only! Move to env variable in production.
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 120
-
-# In-memory mock DBs for demo:
-users_db: Dict[str, dict] = {}  # email: {password_hash, username, id}
-sessions_db: Dict[int, dict] = {}  # game_id: {game, players, start, moves}
-user_games: Dict[int, List[int]] = {}  # user_id: List[game_id]
-game_id_counter = 1
-user_id_counter = 1
+AI_MODE = os.getenv("TTT_AI_MODE", "perfect")  # see core.AI_MODES
+LARGE_BOARD_AI_MODE = os.getenv("TTT_LARGE_BOARD_AI_MODE", "mcts")  # anything bigger than 3x3
+MCTS_PLAYOUTS = int(os.getenv("TTT_MCTS_PLAYOUTS", "0")) or None
+MCTS_TIME_BUDGET = float(os.getenv("TTT_MCTS_TIME_BUDGET", "0.5")) or None  # seconds per AI move
+AI_EXECUTOR = os.getenv("TTT_AI_EXECUTOR", "process")  # "process" or "thread"
+AI_WORKERS = int(os.getenv("TTT_AI_WORKERS", str(min(4, os.cpu_count() or 1))))
+AI_DEADLINE = float(os.getenv("TTT_AI_DEADLINE", "2.0"))  # seconds before falling back to a naive move
+STORAGE_BACKEND = os.getenv("TTT_STORAGE", "memory")  # "memory" or "sqlite"
+SQLITE_PATH = os.getenv("TTT_SQLITE_PATH", "tictactoe.db")
+SQLITE_POOL_SIZE = int(os.getenv("TTT_SQLITE_POOL_SIZE", "4"))
+JOURNAL_FLUSH_INTERVAL = float(os.getenv("TTT_JOURNAL_FLUSH_INTERVAL", "0.05"))  # seconds
+JOURNAL_BATCH_SIZE = int(os.getenv("TTT_JOURNAL_BATCH_SIZE", "500"))
+JOURNAL_MAX_PENDING = int(os.getenv("TTT_JOURNAL_MAX_PENDING", "10000"))  # most events a crash can lose
+SNAPSHOT_EVERY = int(os.getenv("TTT_SNAPSHOT_EVERY", "8"))  # events between snapshots of a game
+RECOVER_ON_STARTUP = os.getenv("TTT_RECOVER_ON_STARTUP", "1") == "1"  # rebuild unfinished games at boot
+FINISHED_GAME_TTL = float(os.getenv("TTT_FINISHED_GAME_TTL", "300"))  # seconds before archiving a finished game
+IDLE_GAME_TTL = float(os.getenv("TTT_IDLE_GAME_TTL", "3600"))  # seconds before evicting an abandoned game
+REAPER_INTERVAL = float(os.getenv("TTT_REAPER_INTERVAL", "30"))
+ARCHIVE_SIZE = int(os.getenv("TTT_ARCHIVE_SIZE", "10000"))  # finished games kept in memory; others reload from storage
+AUTH_CACHE_SIZE = int(os.getenv("TTT_AUTH_CACHE_SIZE", "10000"))  # verified tokens kept; 0 disables the cache
+AUTH_CACHE_TTL = float(os.getenv("TTT_AUTH_CACHE_TTL", "300"))  # seconds before a cached token is re-verified
+KDF_WORKERS = int(os.getenv("TTT_KDF_WORKERS", "2"))  # threads for password hashing; caps its CPU share
+KDF_MAX_WAITING = int(os.getenv("TTT_KDF_MAX_WAITING", "256"))  # queued hashes before /login and /register get 503
+WS_QUEUE_SIZE = int(os.getenv("TTT_WS_QUEUE_SIZE", "16"))  # frames buffered per socket before the oldest is dropped
+BUS_BACKEND = os.getenv("TTT_BUS", "memory")  # "memory" for one worker, "unix" for several on one host
+BUS_PATH = os.getenv("TTT_BUS_PATH", "/tmp/tictactoe-bus.sock")  # Unix socket shared by the workers
+# Write each event before acknowledging it, so two workers sharing storage can't both take a game's next seq.
+CLAIM_EVENTS = os.getenv("TTT_CLAIM_EVENTS", "0" if BUS_BACKEND == "memory" else "1") == "1"
+ELO_K_FACTOR = float(os.getenv("TTT_ELO_K_FACTOR", "32"))  # changing it takes effect at the next startup rebuild
+
+# Users, game metadata and game event logs live in the storage backend. sessions_db
+# is this process's cache of live games, rebuilt from snapshot + events on a miss.
+storage = create_storage(STORAGE_BACKEND, SQLITE_PATH, SQLITE_POOL_SIZE)
+# A game whose events storage refused is dropped from sessions_db, to be rebuilt from what was stored.
+event_journal = EventJournal(storage, JOURNAL_FLUSH_INTERVAL, JOURNAL_BATCH_SIZE, JOURNAL_MAX_PENDING,
+                             on_refused=lambda game_id: sessions_db.pop(game_id, None))
+sessions_db: Dict[int, GameSession] = {}  # live games
+# One lock per game with a move in progress, so a game's moves (and AI replies) run one at a time.
+move_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+archive_db = ArchiveCache(ARCHIVE_SIZE)  # recently used finished games, moved out of sessions_db by the reaper
+position_counts: Counter[int] = Counter()  # canonical board code: times reached
+leaderboard = Leaderboard(ELO_K_FACTOR)  # rebuilt from storage at startup, then updated as games finish
+leaderboard_cache = VersionedResponseCache("lb")  # /leaderboard bodies for leaderboard.version
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+token_cache = TokenCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+password_hasher = PasswordHasher(KDF_WORKERS, KDF_MAX_WAITING)
+game_broadcaster = GameBroadcaster(WS_QUEUE_SIZE)  # this worker's /ws/game subscribers, fed from message_bus
+message_bus = create_bus(BUS_BACKEND, BUS_PATH)  # every worker's accepted moves
+ws_frames = TypeAdapter(WSClientFrame)
+ai_executor = AIExecutor(AI_EXECUTOR, AI_WORKERS, AI_DEADLINE)
+session_reaper = SessionReaper(sessions_db, archive_db, event_journal, FINISHED_GAME_TTL, IDLE_GAME_TTL, REAPER_INTERVAL)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Start the AI pool, event journal, message bus and reaper and recover unfinished games; on exit, flush pending events."""
+    await ai_executor.start()
+    await event_journal.start()
+    await message_bus.start()
+    leaderboard.rebuild(storage.finished_games())
+    if RECOVER_ON_STARTUP:
+        for gid in storage.unfinished_game_ids():
+            await load_session(gid)
+    await session_reaper.start()
+    yield
+    await session_reaper.stop()
+    await message_bus.stop()
+    ai_executor.shutdown()
+    password_hasher.shutdown()
+    await event_journal.stop()
+    storage.close()
+
 
 app = FastAPI(
     title="Tic Tac Toe API",
@@ -45,7 +137,9 @@ app = FastAPI(
         {"name": "history", "description": "Retrieve game history"},
         {"name": "ws", "description": "Websockets for real-time updates"},
         {"name": "leaderboard", "description": "Current leaderboard"},
+        {"name": "metrics", "description": "Runtime metrics"},
     ],
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -57,12 +151,170 @@ app.add_middleware(
 )
 
 ##---- Utility Functions ----##
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+def new_game(size: int = 3, k: int = 3) -> Union[BitboardGame, TicTacToeGame]:
+    """Classic games use the bitboard engine; other sizes use the general N x N engine."""
+    if size == 3 and k == 3:
+        return BitboardGame()
+    return TicTacToeGame(size=size, k=k)
+
+
+def session_record(game_id: int, game, players: List[str], is_ai: bool, created_at: datetime) -> GameSession:
+    """Build the live sessions_db entry for a game."""
+    game_rec = GameSession(game_id, game, tuple(players), is_ai, to_epoch_us(created_at))
+    if is_ai and game.size > 3 and LARGE_BOARD_AI_MODE == "mcts":
+        # One engine per game so its search tree carries over between moves.
+        game_rec.mcts = MCTSEngine(game.size, game.k, MCTS_PLAYOUTS, MCTS_TIME_BUDGET)
+    return game_rec
+
+
+T = TypeVar("T")
+
+
+async def in_storage(call: Callable[..., T], *args, **kwargs) -> T:
+    """Run a storage call from async code: in a thread if the backend blocks, else inline."""
+    if storage.blocking:
+        return await asyncio.to_thread(call, *args, **kwargs)
+    return call(*args, **kwargs)
+
+
+def rebuild_session(game_id: int) -> Optional[GameSession]:
+    """A game's record rebuilt from its latest snapshot and event log, without caching it (blocking)."""
+    meta = storage.get_game(game_id)
+    if meta is None:
+        return None
+    game = new_game(meta["size"], meta["k"])
+    game_rec = session_record(game_id, game, meta["players"], meta["is_ai"], meta["created_at"])
+    snapshot = storage.get_snapshot(game_id)
+    since = snapshot["seq"] if snapshot else 0
+    replay(game_rec, snapshot, storage.get_events(game_id, since=since))
+    return game_rec
+
+
+def cached_session(game_id: int) -> Union[GameSession, ArchivedGame, None]:
+    """This worker's copy of a game, if it holds one; never touches storage."""
+    return sessions_db.get(game_id) or archive_db.get(game_id)
+
+
+async def load_session(game_id: int) -> Union[GameSession, ArchivedGame, None]:
+    """Live record for a game, or its ArchivedGame once it is finished and archived.
+
+    On a miss the game is rebuilt from storage; if it turns out to be finished
+    it goes straight to the archive. A cached live record is used as is:
+    other workers' moves reach it over message_bus (see on_game_update).
+    """
+    cached = cached_session(game_id)
+    if cached is not None:
+        if isinstance(cached, GameSession):
+            cached.last_active = time.monotonic()
+        return cached
+    game_rec = await in_storage(rebuild_session, game_id)
+    if game_rec is None:
+        return None
+    if game_rec.completed_at is not None:
+        archived = ArchivedGame.from_session(game_rec)
+        archive_db.put(archived)
+        return archived
+    # Another request may have rebuilt the game while this one waited on storage.
+    game_rec = sessions_db.setdefault(game_id, game_rec)
+    game_rec.last_active = time.monotonic()
+    return game_rec
+
+
+def move_lock(game_id: int) -> asyncio.Lock:
+    """The lock serializing moves in a game; held from loading the game until its update is published."""
+    lock = move_locks.get(game_id)
+    if lock is None:
+        lock = move_locks[game_id] = asyncio.Lock()
+    return lock
+
+
+async def record_event(game_rec: GameSession, kind: str, data: dict,
+                       emitted: Optional[List[GameEvent]] = None) -> Optional[MoveResult]:
+    """Apply a new event to the live record and queue it for storage (and add it to `emitted`, if given).
+
+    Rejected moves are neither applied nor stored. Every SNAPSHOT_EVERY events,
+    and when the game ends, a snapshot is queued with the event.
+
+    With CLAIM_EVENTS the event is written right away instead. If that write
+    fails, the cached game (already one event ahead) is dropped so the next
+    access rebuilds it from storage; a seq another worker already stored
+    becomes a 409, anything else propagates.
+    """
+    event = GameEvent(game_rec.id, game_rec.seq, kind, data)
+    result = apply_event(game_rec, event)
+    if kind in (MOVE, AI_MOVE) and not result:
+        return result
+    if CLAIM_EVENTS:
+        try:
+            await in_storage(storage.write_events, [event], [])
+        except BaseException as e:  # cancellation too: the write may not have happened
+            if sessions_db.get(game_rec.id) is game_rec:
+                del sessions_db[game_rec.id]
+            if isinstance(e, DuplicateEventError):
+                raise HTTPException(status_code=409, detail="The game moved on in the meantime; reload it and retry.")
+            raise
+    game_rec.last_active = time.monotonic()
+    snapshot = None
+    if kind == FINISHED or game_rec.seq - game_rec.snapshot_seq >= SNAPSHOT_EVERY:
+        snapshot = take_snapshot(game_rec)
+        game_rec.snapshot_seq = game_rec.seq
+    await event_journal.append(event, snapshot, stored=CLAIM_EVENTS)
+    if emitted is not None:
+        emitted.append(event)
+    if kind in (MOVE, AI_MOVE):
+        record_position(game_rec.game)
+    return result
+
+
+def status_label(winner: Optional[str], draw: bool) -> str:
+    return "won" if winner else ("draw" if draw else "continue")
+
+
+def state_frame(game_rec: Union[GameSession, ArchivedGame], codec: str = JSON) -> Frame:
+    """Full game state as a /ws/game frame: JSON text, or a wire.encode_state() frame for binary sockets."""
+    if isinstance(game_rec, ArchivedGame):
+        winner, draw, next_turn = game_rec.winner, game_rec.winner is None, None
+    else:
+        game = game_rec.game
+        winner, draw = game.check_winner(), game.is_draw()
+        next_turn = None if winner is not None or draw else game.current
+    if codec == BINARY:
+        cells = game_rec.cells() if isinstance(game_rec, ArchivedGame) else game_rec.moves
+        return encode_state(game_rec.size, cells, winner, draw)
+    return json.dumps({"type": "state", "board": game_rec.serialize_board(), "next_turn": next_turn,
+                       "winner": winner, "status": status_label(winner, draw)})
+
 
+def delta_frame(update: GameUpdate, codec: str = JSON) -> Frame:
+    """The moves one request added, as a /ws/game frame for clients that already hold the state."""
+    if codec == BINARY:
+        return encode_delta(update.size, update.moves, update.winner, update.draw, update.next_turn)
+    return json.dumps({"type": "delta", "moves": update.moves, "next_turn": update.next_turn,
+                       "winner": update.winner, "status": status_label(update.winner, update.draw)})
 
-def verify_password(password: str, pw_hash: str) -> bool:
-    return hash_password(password) == pw_hash
+
+def error_frame(detail: Union[str, list], ref: Optional[str] = None) -> str:
+    return json.dumps({"type": "error", "detail": detail, "ref": ref})
+
+
+def record_position(game) -> None:
+    """Count the position for /position_stats (classic 3x3 games only)."""
+    if isinstance(game, BitboardGame):
+        position_counts[canonical_code(game.x_bits, game.o_bits)] += 1
+
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusyError:
+        raise HTTPException(status_code=503, detail="Too many sign-ins, try again shortly", headers={"Retry-After": "1"})
+
+
+async def verify_password(password: str, pw_hash: str) -> bool:
+    try:
+        return await password_hasher.verify(password, pw_hash)
+    except HasherBusyError:
+        raise HTTPException(status_code=503, detail="Too many sign-ins, try again shortly", headers={"Retry-After": "1"})
 
 
 # PUBLIC_INTERFACE
@@ -75,17 +327,29 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    """Decode JWT and load user from mock db. Raises on error."""
+    """Decode JWT and load user from storage, via token_cache for tokens seen recently. Raises on error."""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+    if token_cache.is_revoked(token):
+        raise HTTPException(status_code=401, detail="Token revoked")
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if not email or email not in users_db:
+        user = await in_storage(storage.get_user_by_email, email) if email else None
+        if user is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        return users_db[email]
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except Exception:
         raise HTTPException(status_code=401, detail="Could not validate credentials")
+    token_cache.put(token, user, payload["exp"])
+    return user
+
+
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[dict]:
+    """Like get_current_user, but None when no token is sent."""
+    return None if token is None else await get_current_user(token)
 
 
 @app.get("/", tags=["health"])
@@ -104,21 +368,17 @@ async def register_user(request: UserRegisterRequest):
     Returns:
         TokenResponse: Authentication JWT token.
     """
-    global user_id_counter
-    if request.email in users_db:
+    if await in_storage(storage.get_user_by_email, request.email) is not None:
         raise HTTPException(status_code=409, detail="Email already registered")
-    for udata in users_db.values():
-        if udata["username"] == request.username:
-            raise HTTPException(status_code=409, detail="Username already taken")
-    pw_hash = hash_password(request.password)
-    user_doc = {
-        "id": user_id_counter,
-        "username": request.username,
-        "email": request.email,
-        "password_hash": pw_hash,
-    }
-    users_db[request.email] = user_doc
-    user_id_counter += 1
+    if await in_storage(storage.get_user_by_username, request.username) is not None:
+        raise HTTPException(status_code=409, detail="Username already taken")
+    pw_hash = await hash_password(request.password)
+    try:
+        await in_storage(storage.add_user, request.email, request.username, pw_hash)
+    except DuplicateUserError as e:
+        # Lost a race with a concurrent registration.
+        detail = "Email already registered" if e.field == "email" else "Username already taken"
+        raise HTTPException(status_code=409, detail=detail)
     token = create_access_token({"sub": request.email})
     return TokenResponse(access_token=token, token_type="bearer")
 
@@ -133,13 +393,28 @@ async def login_user(request: UserLoginRequest):
     Returns:
         TokenResponse: JWT on success.
     """
-    user = users_db.get(request.email)
-    if user is None or not verify_password(request.password, user["password_hash"]):
+    user = await in_storage(storage.get_user_by_email, request.email)
+    pw_hash = user["password_hash"] if user is not None else DUMMY_HASH
+    if not await verify_password(request.password, pw_hash) or user is None:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if needs_rehash(user["password_hash"]):
+        # Legacy SHA-256 (or older scrypt parameters): upgrade now that we know the password.
+        await in_storage(storage.update_password_hash, user["id"], await hash_password(request.password))
+        password_hasher.rehashed += 1
+        token_cache.revoke_user(user["email"])
     token = create_access_token({"sub": user["email"]})
     return TokenResponse(access_token=token, token_type="bearer")
 
 
+# PUBLIC_INTERFACE
+@app.post("/logout", status_code=204, tags=["auth"], summary="Revoke the current token")
+async def logout_user(token: str = Depends(oauth2_scheme), user: dict = Depends(get_current_user)):
+    """Revoke the bearer token used for this request; it is rejected from now until it expires."""
+    exp = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["exp"]
+    token_cache.revoke(token, exp)
+    return Response(status_code=204)
+
+
 # PUBLIC_INTERFACE
 @app.post("/new_game", response_model=int, tags=["game"], summary="Start new game")
 async def start_game(request: GameStartRequest, user: dict = Depends(get_current_user)):
@@ -148,66 +423,137 @@ async def start_game(request: GameStartRequest, user: dict = Depends(get_current
     - If human: expects opponent_username to be a valid user (demo: makes vs AI if missing).
     Returns: game ID.
     """
-    global game_id_counter
     players = [user["username"]]
+    player_ids = [user["id"]]
     opponent = None
     if request.opponent_type == "human" and request.opponent_username:
-        for udata in users_db.values():
-            if udata["username"] == request.opponent_username:
-                opponent = udata["username"]
-                break
+        opponent_doc = await in_storage(storage.get_user_by_username, request.opponent_username)
+        if opponent_doc is not None:
+            opponent = opponent_doc["username"]
         if not opponent:
             raise HTTPException(status_code=404, detail="Opponent not found")
         players.append(opponent)
+        player_ids.append(opponent_doc["id"])
         is_ai = False
     else:
         players.append("AI")
         is_ai = True
 
-    game = TicTacToeGame()
-    game_rec = {
-        "id": game_id_counter,
-        "game": game,
-        "players": players,
-        "is_ai": is_ai,
-        "player_turn": players[0],
-        "moves": [],
-        "created_at": datetime.utcnow(),
-        "winner": None,
-    }
-    sessions_db[game_id_counter] = game_rec
-    # Track for user history:
-    for uname in players:
-        uid = None
-        for u in users_db.values():
-            if u["username"] == uname:
-                uid = u["id"]
-                break
-        if uid is not None:
-            user_games.setdefault(uid, []).append(game_id_counter)
-    gid = game_id_counter
-    game_id_counter += 1
+    k = request.win_length or min(request.board_size, 5)
+    if k > request.board_size:
+        raise HTTPException(status_code=422, detail="win_length cannot exceed board_size")
+    game = new_game(request.board_size, k)
+    created_at = datetime.utcnow()
+    # Also links the game to each player's history.
+    gid = await in_storage(storage.create_game, players, player_ids, is_ai, game.size, game.k, created_at)
+    game_rec = session_record(gid, game, players, is_ai, created_at)
+    sessions_db[gid] = game_rec
+    await record_event(game_rec, CREATED, {
+        "players": players, "is_ai": is_ai, "size": game.size, "k": game.k, "created_at": created_at.isoformat(),
+    })
     return gid
 
 
+async def play_move(game_rec: GameSession, username: str, row: int, col: int
+                    ) -> Tuple[MoveResult, List[Tuple[int, int, str]], Optional[str]]:
+    """Play a player's move and any AI reply in a live game, and publish the update on message_bus.
+
+    Shared by /make_move and /ws/game, which call it holding move_lock(game id).
+    Returns (result, moves played, AI note); the result is falsy if the move
+    was rejected, including when it isn't `username`'s turn. Raises
+    HTTPException for out-of-bounds moves, and a 409 (see record_event) if
+    another worker stored a move first.
+    """
+    gid = game_rec.id
+    mark = "X" if username == game_rec.players[0] else "O"
+    game: Union[BitboardGame, TicTacToeGame] = game_rec.game
+    if row >= game.size or col >= game.size:
+        raise HTTPException(status_code=422, detail=f"Move out of bounds for a {game.size}x{game.size} board.")
+    if mark != game.current:
+        return INVALID_MOVE, [], None
+    events: List[GameEvent] = []
+    result = await record_event(game_rec, MOVE, {"player": username, "row": row, "col": col, "symbol": mark},
+                                events)
+    if not result:
+        return result, [], None
+    moves = [(row, col, mark)]
+
+    # AI move (if applicable and it's AI's turn next)
+    ai_message = None
+    if game_rec.is_ai and not result.finished and game.current == "O":
+        mode = AI_MODE if game.size == 3 else LARGE_BOARD_AI_MODE
+        ai_row, ai_col = await ai_executor.move(game.serialize_board(), "O", mode, game.k, game_rec.mcts)
+        if ai_row != -1 and ai_col != -1:
+            ai_result = await record_event(game_rec, AI_MOVE,
+                                           {"player": "AI", "row": ai_row, "col": ai_col, "symbol": "O"}, events)
+            if ai_result:
+                result = ai_result
+                moves.append((ai_row, ai_col, "O"))
+                ai_message = f"AI played at row={ai_row}, col={ai_col}"
+    if result.finished:
+        completed_at = datetime.utcnow()
+        await record_event(game_rec, FINISHED, {"winner": result.winner, "completed_at": completed_at.isoformat()},
+                           events)
+        await in_storage(storage.finish_game, gid, result.winner, completed_at)
+    next_turn = None if result.finished else game.current
+    message_bus.publish(GameUpdate(gid, game.size, game_rec.players, moves, result.winner, result.draw, next_turn,
+                                   events))
+    return result, moves, ai_message
+
+
+def on_game_update(update: GameUpdate, remote: bool) -> None:
+    """message_bus handler: fan a move out to this worker's sockets and count finished games.
+
+    Another worker's move also advances this worker's copy of the game, if it
+    has one; a copy that is out of step is dropped, to be rebuilt from storage.
+    (With CLAIM_EVENTS, moves are stored before they are published, so the
+    rebuilt copy includes them.)
+    """
+    if remote:
+        game_rec = sessions_db.get(update.game_id)
+        if game_rec is not None:
+            if update.events and update.events[0].seq == game_rec.seq:
+                for event in update.events:
+                    apply_event(game_rec, event)
+                game_rec.last_active = time.monotonic()
+            else:
+                sessions_db.pop(update.game_id, None)
+    if update.winner is not None or update.draw:
+        leaderboard.record_result(update.players, update.winner)
+    game_broadcaster.publish(update.game_id, lambda codec: delta_frame(update, codec))
+
+
+message_bus.subscribe(on_game_update)
+
+
 # PUBLIC_INTERFACE
 @app.post("/make_move", response_model=MoveResponse, tags=["game"], summary="Make a move")
 async def make_move(request: MoveRequest, user: dict = Depends(get_current_user)):
     """Play a move in an active game. Returns new game state, status, winner (if over)."""
+    async with move_lock(request.game_id):
+        return await apply_move_request(request, user["username"])
+
+
+async def apply_move_request(request: MoveRequest, username: str) -> MoveResponse:
+    """/make_move's body, run under the game's move_lock."""
     gid = request.game_id
-    if gid not in sessions_db:
+    game_rec = await load_session(gid)
+    if game_rec is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    game_rec = sessions_db[gid]
-    username = user["username"]
-    if username not in game_rec["players"]:
+    if username not in game_rec.players:
         raise HTTPException(status_code=403, detail="You are not a player in this game.")
+    if isinstance(game_rec, ArchivedGame):
+        return MoveResponse(
+            board=game_rec.serialize_board(),
+            status="invalid",
+            message="Game is over.",
+            winner=game_rec.winner,
+            next_turn=None,
+        )
 
-    # Mark the move
-    mark = "X" if username == game_rec["players"][0] else "O"
-    game: TicTacToeGame = game_rec["game"]
-    success = game.make_move(request.row, request.col, mark if game.current == mark else game.current)
-
-    if not success:
+    result, _, ai_message = await play_move(game_rec, username, request.row, request.col)
+    game: Union[BitboardGame, TicTacToeGame] = game_rec.game
+    if not result:
         return MoveResponse(
             board=game.serialize_board(),
             status="invalid",
@@ -215,26 +561,10 @@ async def make_move(request: MoveRequest, user: dict = Depends(get_current_user)
             winner=None,
             next_turn=game.current,
         )
+    winner = result.winner
+    is_draw = result.draw
 
-    game_rec["moves"].append({"player": username, "pos": (request.row, request.col), "symbol": mark})
-    winner = game.check_winner()
-    is_draw = game.is_draw()
-
-    # AI move (if applicable and it's AI's turn next)
-    ai_message = None
-    if game_rec["is_ai"] and game.current == "O":
-        row, col = ai_move(game.serialize_board(), "O")
-        if row != -1 and col != -1:
-            game.make_move(row, col, "O")
-            game_rec["moves"].append({"player": "AI", "pos": (row, col), "symbol": "O"})
-        # Recompute winner:
-        winner = game.check_winner()
-        is_draw = game.is_draw()
-        ai_message = f"AI played at row={row}, col={col}"
-
-    # Set winner; cleanup if done
     if winner:
-        game_rec["winner"] = winner
         game_status = "won"
         message = f"Winner is {winner}" + (f". {ai_message}" if ai_message else "")
     elif is_draw:
@@ -257,16 +587,22 @@ async def make_move(request: MoveRequest, user: dict = Depends(get_current_user)
 @app.get("/game_state/{game_id}", response_model=MoveResponse, tags=["game"], summary="Get current game state")
 async def get_game_state(game_id: int, user: dict = Depends(get_current_user)):
     """Get board state and info for a running game."""
-    if game_id not in sessions_db:
+    game_rec = await load_session(game_id)
+    if game_rec is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    game_rec = sessions_db[game_id]
-    game: TicTacToeGame = game_rec["game"]
+    if isinstance(game_rec, ArchivedGame):
+        return MoveResponse(
+            board=game_rec.serialize_board(),
+            status=status_label(game_rec.winner, game_rec.winner is None),
+            winner=game_rec.winner,
+            next_turn=None,
+        )
+    game: Union[BitboardGame, TicTacToeGame] = game_rec.game
     winner = game.check_winner()
     draw = game.is_draw()
-    game_status = "won" if winner else ("draw" if draw else "continue")
     return MoveResponse(
         board=game.serialize_board(),
-        status=game_status,
+        status=status_label(winner, draw),
         winner=winner,
         next_turn=game.current if not (winner or draw) else None,
     )
@@ -274,64 +610,206 @@ async def get_game_state(game_id: int, user: dict = Depends(get_current_user)):
 
 # PUBLIC_INTERFACE
 @app.get("/game_history", response_model=GameHistoryResponse, tags=["history"], summary="Get current user's game history")
-async def get_history(user: dict = Depends(get_current_user)):
-    """Fetch games played by currently logged in user."""
-    uid = user["id"]
+async def get_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page."),
+    result: Optional[Literal["won", "lost", "draw", "ongoing"]] = Query(None, description="From your side."),
+    opponent: Optional[str] = Query(None, description="Opponent username, or AI."),
+    user: dict = Depends(get_current_user),
+):
+    """Games played by the logged in user, newest first, one page at a time."""
+    rows = await in_storage(storage.user_games_page, user["id"], before=cursor, limit=limit + 1, result=result,
+                            opponent=opponent)
     history = []
-    for gid in user_games.get(uid, []):
-        gm = sessions_db.get(gid)
-        if gm:
-            history.append(GameHistoryItem(
-                game_id=gm["id"],
-                started_at=gm["created_at"],
-                completed_at=None,  # Not tracking in-memory (could use winner for this)
-                players=gm["players"],
-                winner=gm["winner"],
-                moves_count=len(gm["moves"]),
-            ))
-    return GameHistoryResponse(history=history)
+    for game in rows[:limit]:
+        # Storage counts moves as the journal writes them; a cached session may be a flush ahead.
+        live = sessions_db.get(game["id"])
+        moves_count = live.moves_count if live is not None else game["moves_count"]
+        history.append(GameHistoryItem(
+            game_id=game["id"],
+            started_at=game["created_at"],
+            completed_at=game["completed_at"],
+            players=game["players"],
+            winner=game["winner"],
+            moves_count=moves_count,
+        ))
+    next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+    return GameHistoryResponse(history=history, next_cursor=next_cursor)
+
+
+def build_leaderboard_response(page, my_rank: Optional[int]) -> LeaderboardResponse:
+    return LeaderboardResponse(
+        leaderboard=[
+            LeaderboardEntry(rank=rank, username=s.username, rating=round(s.rating, 1), wins=s.wins,
+                             losses=s.losses, draws=s.draws, games_played=s.games_played)
+            for rank, s in page
+        ],
+        total=len(leaderboard),
+        my_rank=my_rank,
+    )
 
 
 # PUBLIC_INTERFACE
-@app.get("/leaderboard", response_model=LeaderboardResponse, tags=["leaderboard"], summary="Get top players leaderboard (stub)")
-async def get_leaderboard():
-    """Leaderboard of top players (stubbed, replace with DB calls in production)."""
-    stub = get_leaderboard_stub()
-    return LeaderboardResponse(
-        leaderboard=[LeaderboardEntry(**entry) for entry in stub]
-    )
+@app.get("/leaderboard", response_model=LeaderboardResponse, tags=["leaderboard"], summary="Get top players leaderboard")
+async def get_leaderboard(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    around_me: bool = Query(False, description="Return the page centred on the caller instead (needs a token)."),
+    user: Optional[dict] = Depends(get_optional_user),
+):
+    """Players ranked by Elo rating, then wins, then fewest losses.
+
+    Serialized bodies are cached per leaderboard version and sent with an
+    ETag; a matching If-None-Match gets an empty 304.
+    """
+    if around_me:
+        if user is None:
+            raise HTTPException(status_code=401, detail="around_me needs a logged-in user")
+        key = ("around", user["username"], limit)
+    else:
+        key = ("page", offset, limit)
+    version = leaderboard.version
+    etag = leaderboard_cache.etag(version, key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        leaderboard_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    body = leaderboard_cache.get(version, key)
+    if body is None:
+        if around_me:
+            page = leaderboard.around(user["username"], limit)
+            response = build_leaderboard_response(page, leaderboard.rank(user["username"]))
+        else:
+            response = build_leaderboard_response(leaderboard.page(offset, limit), None)
+        body = response.model_dump_json().encode()
+        leaderboard_cache.put(version, key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# PUBLIC_INTERFACE
+@app.get("/position_stats", response_model=PositionStatsResponse, tags=["game"], summary="Most reached positions")
+async def get_position_stats(limit: int = 10):
+    """Most frequently reached positions, with symmetric boards counted together."""
+    positions = []
+    for code, count in position_counts.most_common(limit):
+        board = BitboardGame()
+        board.x_bits, board.o_bits = decode(code)
+        positions.append(PositionStatsEntry(board=board.serialize_board(), count=count))
+    return PositionStatsResponse(positions=positions)
+
+
+async def ws_move(game_id: int, user: Optional[dict], row: int, col: int) -> Optional[str]:
+    """Play a move sent over /ws/game; the error detail if it was rejected, else None (the delta is broadcast)."""
+    if user is None:
+        return "Connect with ?token= to play moves."
+    async with move_lock(game_id):
+        game_rec = await load_session(game_id)
+        if game_rec is None:
+            return "Game not found"
+        if user["username"] not in game_rec.players:
+            return "You are not a player in this game."
+        if isinstance(game_rec, ArchivedGame):
+            return "Game is over."
+        try:
+            result, _, _ = await play_move(game_rec, user["username"], row, col)
+        except HTTPException as e:
+            return e.detail
+        return None if result else "Invalid move! Cell already taken or not your turn."
 
 
 # PUBLIC_INTERFACE
 @app.websocket("/ws/game/{game_id}")
-async def websocket_game_updates(websocket: WebSocket, game_id: int):
+async def websocket_game_updates(websocket: WebSocket, game_id: int, token: Optional[str] = Query(None)):
     """
-    WebSocket for broadcasting game updates to clients. Usage: connect to ws://host/ws/game/{game_id}.
-    Provides push update after every move.
-
-    Project Note: To use: Open the websocket and receive/send messages for real-time board state.
+    WebSocket for real-time play. Usage: connect to ws://host/ws/game/{game_id}?token=JWT.
+
+    The token is checked once, at connect; without one the socket can watch but not
+    play. The server sends {"type": "state"} on connect, then a {"type": "delta"}
+    with the new moves after every accepted move, whether made here or via /make_move.
+    Client frames: {"type": "move", "row", "col", "ref"?}, {"type": "ping"} and
+    {"type": "state"}; a rejected frame gets {"type": "error", "detail", "ref"}.
+    Plain "ping" and other plain text still work as before.
+
+    Clients that offer the "ttt.bin.v1" subprotocol (Sec-WebSocket-Protocol) get
+    state and delta frames in the packed binary format of wire.py instead, and
+    may send moves as 2-byte cell indexes.
     """
-    await websocket.accept()
+    user = None
+    if token is not None:
+        try:
+            user = await get_current_user(token)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    codec = BINARY if SUBPROTOCOL in websocket.scope.get("subprotocols", ()) else JSON
+    await websocket.accept(subprotocol=SUBPROTOCOL if codec == BINARY else None)
+    game_rec = await load_session(game_id)
+    if game_rec is None:
+        await websocket.send_text("Invalid game_id")
+        await websocket.close()
+        return
+    size = game_rec.size
+
+    async def snapshot() -> Frame:
+        current = await load_session(game_id)
+        return state_frame(current, codec) if current is not None else error_frame("Game not found")
+
+    subscriber = game_broadcaster.subscribe(game_id, websocket, snapshot, codec)
+    subscriber.push(state_frame(game_rec, codec))
     try:
-        while True:
-            if websocket.application_state != WebSocketState.CONNECTED:
+        while websocket.application_state == WebSocketState.CONNECTED:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
                 break
-            # For demo: just echo ping requests, in prod add pub/sub for moves
-            data = await websocket.receive_text()
-            if data == "ping":
-                await websocket.send_text("pong")
-            elif game_id in sessions_db:
-                game_rec = sessions_db[game_id]
-                game: TicTacToeGame = game_rec["game"]
-                await websocket.send_json({
-                    "board": game.serialize_board(),
-                    "next_turn": game.current,
-                    "winner": game.check_winner(),
-                })
+            if message.get("bytes") is not None:
+                move = decode_move(message["bytes"], size)
+                detail = "Bad move frame." if move is None else await ws_move(game_id, user, *move)
+                if detail is not None:
+                    subscriber.push(error_frame(detail))
+                continue
+            data = message.get("text") or ""
+            if not data.startswith("{"):
+                if data == "ping":
+                    subscriber.push("pong")
+                else:
+                    subscriber.resync()
+                continue
+            try:
+                frame = ws_frames.validate_json(data)
+            except ValidationError as e:
+                subscriber.push(error_frame(e.errors(include_url=False, include_context=False)))
+                continue
+            if frame.type == "ping":
+                subscriber.push('{"type": "pong"}')
+            elif frame.type == "state":
+                subscriber.resync()
             else:
-                await websocket.send_text("Invalid game_id")
+                detail = await ws_move(game_id, user, frame.row, frame.col)
+                if detail is not None:
+                    subscriber.push(error_frame(detail, frame.ref))
     except WebSocketDisconnect:
         pass
+    finally:
+        await game_broadcaster.unsubscribe(game_id, subscriber)
+
+
+# PUBLIC_INTERFACE
+@app.get("/metrics", tags=["metrics"], summary="Runtime metrics")
+def get_metrics():
+    """AI pool, event journal, reaper, cache, password hashing, WebSocket fan-out and message bus counters."""
+    return {
+        "ai_executor": ai_executor.metrics(),
+        "event_journal": event_journal.metrics(),
+        "session_reaper": session_reaper.metrics(),
+        "archive_cache": archive_db.metrics(),
+        "leaderboard_cache": leaderboard_cache.metrics(),
+        "token_cache": token_cache.metrics(),
+        "password_hasher": password_hasher.metrics(),
+        "game_broadcaster": game_broadcaster.metrics(),
+        "message_bus": message_bus.metrics(),
+    }
+
 
 # Misc: Docs route for websocket usage notes
 @app.get("/websocket_info", tags=["ws"], summary="Get websocket usage instructions")
@@ -339,6 +817,9 @@ def websocket_info():
     """Instructions for real-time connection via websocket."""
     return {
         "usage":
-            "Connect using WebSocket at ws://HOST/ws/game/{game_id} to receive/send game state updates in real-time. "
-            "Send 'ping' for a pong, or any text to get latest board update."
+            "Connect using WebSocket at ws://HOST/ws/game/{game_id}?token=JWT. The server sends a 'state' frame on "
+            "connect, then a 'delta' frame with the new moves after every move. Send {\"type\": \"move\", "
+            "\"row\": r, \"col\": c} to play (needs the token), {\"type\": \"state\"} for the full state, or "
+            "{\"type\": \"ping\"}. Without a token the socket is read-only. Offer the 'ttt.bin.v1' subprotocol "
+            "for packed binary state/delta frames (see wire.py)."
     }
@@ -0,0 +1,329 @@
+import math
+import random
+import time
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+
+# Boards are flat bytearrays of size * size cells, row-major. Cell values are
+# relative to the engine's own symbol: 0 empty, MINE, THEIRS.
+EMPTY, MINE, THEIRS = 0, 1, 2
+DRAW = 3
+EXPLORATION = math.sqrt(2)
+# Tree moves are limited to empty cells within this distance of a stone, which
+# keeps the branching factor sane on gomoku-sized boards.
+CANDIDATE_RADIUS = 2
+DEFAULT_PLAYOUTS = 1000
+# Playouts stop after this many moves and count as a draw. Local playouts
+# (see _rollout) are decided well before this almost every time.
+ROLLOUT_DEPTH = 80
+
+
+@lru_cache(maxsize=None)
+def _rays(size: int, k: int) -> Tuple[Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...], ...]:
+    """rays[cell] = 4 (forward, backward) tuples of up to k - 1 cells, one per direction."""
+    rays = []
+    for cell in range(size * size):
+        r0, c0 = divmod(cell, size)
+        per_dir = []
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            pair = []
+            for sign in (1, -1):
+                ray = []
+                r, c = r0 + sign * dr, c0 + sign * dc
+                while len(ray) < k - 1 and 0 <= r < size and 0 <= c < size:
+                    ray.append(r * size + c)
+                    r += sign * dr
+                    c += sign * dc
+                pair.append(tuple(ray))
+            per_dir.append(tuple(pair))
+        rays.append(tuple(per_dir))
+    return tuple(rays)
+
+
+@lru_cache(maxsize=None)
+def _adjacent(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """The up to 8 cells touching each cell."""
+    out = []
+    for cell in range(size * size):
+        r0, c0 = divmod(cell, size)
+        out.append(tuple(
+            r * size + c
+            for r in range(max(0, r0 - 1), min(size, r0 + 2))
+            for c in range(max(0, c0 - 1), min(size, c0 + 2))
+            if (r, c) != (r0, c0)
+        ))
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _neighbours(size: int) -> Tuple[Tuple[int, ...], ...]:
+    out = []
+    for cell in range(size * size):
+        r0, c0 = divmod(cell, size)
+        out.append(tuple(
+            r * size + c
+            for r in range(max(0, r0 - CANDIDATE_RADIUS), min(size, r0 + CANDIDATE_RADIUS + 1))
+            for c in range(max(0, c0 - CANDIDATE_RADIUS), min(size, c0 + CANDIDATE_RADIUS + 1))
+            if (r, c) != (r0, c0)
+        ))
+    return tuple(out)
+
+
+class _Node:
+    __slots__ = ("move", "parent", "children", "untried", "visits", "score", "mover", "result")
+
+    def __init__(self, move: int, parent: Optional["_Node"], mover: int, result: int = EMPTY):
+        self.move = move
+        self.parent = parent
+        self.children: List["_Node"] = []
+        self.untried: Optional[List[int]] = None  # filled lazily on first visit
+        self.visits = 0
+        self.score = 0.0  # from the point of view of `mover`, who played `move`
+        self.mover = mover
+        self.result = result  # EMPTY while the game goes on, else winner or DRAW
+
+
+# PUBLIC_INTERFACE
+class MCTSEngine:
+    """UCT Monte Carlo Tree Search for one side of one game.
+
+    Keep one engine per game: the subtree under the chosen move (and under the
+    opponent's reply, when it was explored) is reused by the next call.
+    Stop after `playouts` iterations or `time_budget` seconds, whichever
+    comes first.
+
+    The empty cells and tree-move candidates of the root position are kept
+    alongside it, and each iteration updates copies of them for the moves it
+    plays instead of rescanning the board.
+    """
+
+    def __init__(self, size: int, k: int, playouts: Optional[int] = None, time_budget: Optional[float] = None,
+                 rollout_depth: int = ROLLOUT_DEPTH):
+        self.size = size
+        self.k = k
+        self.playouts = playouts if playouts or time_budget else DEFAULT_PLAYOUTS
+        self.time_budget = time_budget
+        self.rollout_depth = rollout_depth
+        self._rays = _rays(size, k)
+        self._neighbours = _neighbours(size)
+        self._adjacent = _adjacent(size)
+        self.root: Optional[_Node] = None
+        self.cells: Optional[bytearray] = None
+        self._empties: List[int] = []  # empty cells of self.cells, in any order
+        self._where: List[int] = []  # _where[cell] = index of cell in _empties
+        self._near: Set[int] = set()  # empty cells within CANDIDATE_RADIUS of a stone
+        self.last_stats: dict = {}
+
+    def _wins(self, cells: bytearray, cell: int, player: int) -> bool:
+        k = self.k
+        for forward, backward in self._rays[cell]:
+            run = 1
+            for c in forward:
+                if cells[c] != player:
+                    break
+                run += 1
+            for c in backward:
+                if cells[c] != player:
+                    break
+                run += 1
+            if run >= k:
+                return True
+        return False
+
+    def _set_cells(self, cells: bytearray) -> None:
+        """Make `cells` the root position and rebuild the per-position indexes from it."""
+        self.cells = bytearray(cells)
+        self._empties = [i for i, v in enumerate(cells) if not v]
+        self._where = [0] * len(cells)
+        for i, cell in enumerate(self._empties):
+            self._where[cell] = i
+        self._near = set()
+        for cell, value in enumerate(cells):
+            if value:
+                self._near.update(nb for nb in self._neighbours[cell] if not cells[nb])
+
+    @staticmethod
+    def _take(empties: List[int], where: List[int], cell: int) -> None:
+        """Remove `cell` from `empties` in O(1), by moving the last entry into its slot."""
+        last = empties.pop()
+        if last != cell:
+            i = where[cell]
+            empties[i] = last
+            where[last] = i
+
+    def _candidates(self, cells: bytearray, empties: List[int], played: List[int]) -> List[int]:
+        """Tree moves for `cells`: the root's candidates, updated for the moves `played` since the root."""
+        near = set(self._near)
+        for move in played:
+            near.discard(move)
+            near.update(nb for nb in self._neighbours[move] if not cells[nb])
+        if near:
+            return list(near)
+        if len(empties) < len(cells):
+            return list(empties)
+        return [(self.size // 2) * self.size + self.size // 2]
+
+    def _rollout(self, cells: bytearray, empties: List[int], played: List[int], to_move: int) -> int:
+        """Local random playout from `cells` (used up); `empties` are its empty cells.
+
+        Each move is drawn from the cells around the stones, as real play
+        mostly is, so playouts end in a win far sooner than filling the board
+        at random. The pool is only appended to; occupied picks are redrawn.
+        """
+        pool = list(self._near)
+        for move in played:
+            pool.extend(self._adjacent[move])
+        if not pool:
+            pool = list(empties)
+        adjacent = self._adjacent
+        rand = random.random
+        wins = self._wins
+        k = self.k
+        player = to_move
+        for _ in range(min(len(empties), self.rollout_depth)):
+            cell = pool[int(rand() * len(pool))]
+            tries = 1
+            while cells[cell]:
+                if tries < 8:
+                    cell = pool[int(rand() * len(pool))]
+                else:
+                    # Crowded pool: any empty cell will do (one is left, as
+                    # there are fewer moves than empties).
+                    cell = empties[int(rand() * len(empties))]
+                tries += 1
+            cells[cell] = player
+            # A move touching none of the mover's stones can't win (k > 1),
+            # and most playout moves don't; skip the full check for those.
+            for nb in adjacent[cell]:
+                if cells[nb] == player:
+                    if k > 1 and wins(cells, cell, player):
+                        return player
+                    break
+            else:
+                if k == 1:
+                    return player
+            pool.extend(adjacent[cell])
+            player = 3 - player
+        return DRAW
+
+    def _reroot(self, cells: bytearray) -> None:
+        """Reuse the previous tree if `cells` is one reply away from its root."""
+        if self.root is not None and self.cells is not None:
+            added = [i for i, (old, new) in enumerate(zip(self.cells, cells)) if old != new]
+            if not added:
+                return
+            if len(added) == 1 and not self.cells[added[0]] and cells[added[0]] == THEIRS:
+                for child in self.root.children:
+                    if child.move == added[0]:
+                        child.parent = None
+                        self.root = child
+                        self._set_cells(cells)
+                        return
+        self.root = _Node(-1, None, THEIRS)
+        self._set_cells(cells)
+
+    @staticmethod
+    def _select(node: _Node) -> _Node:
+        """The child with the best UCB1 score."""
+        log_n = math.log(node.visits)
+        sqrt = math.sqrt
+        best, best_value = None, -1.0
+        for child in node.children:
+            visits = child.visits
+            value = child.score / visits + EXPLORATION * sqrt(log_n / visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def _iterate(self) -> None:
+        node = self.root
+        cells = bytearray(self.cells)
+        empties = self._empties[:]
+        where = self._where[:]
+        played: List[int] = []
+        # Selection
+        while node.result == EMPTY and node.untried is not None and not node.untried and node.children:
+            node = self._select(node)
+            cells[node.move] = node.mover
+            self._take(empties, where, node.move)
+            played.append(node.move)
+        # Expansion
+        if node.result == EMPTY:
+            if node.untried is None:
+                node.untried = self._candidates(cells, empties, played)
+                random.shuffle(node.untried)
+            if node.untried:
+                move = node.untried.pop()
+                mover = 3 - node.mover
+                cells[move] = mover
+                self._take(empties, where, move)
+                played.append(move)
+                if self._wins(cells, move, mover):
+                    result = mover
+                elif not empties:
+                    result = DRAW
+                else:
+                    result = EMPTY
+                child = _Node(move, node, mover, result)
+                node.children.append(child)
+                node = child
+        # Simulation
+        winner = node.result if node.result != EMPTY else self._rollout(cells, empties, played, 3 - node.mover)
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.mover:
+                node.score += 1.0
+            elif winner == DRAW:
+                node.score += 0.5
+            node = node.parent
+
+    # PUBLIC_INTERFACE
+    def choose(self, cells: bytearray) -> int:
+        """Best cell for MINE to play on `cells`, or -1 if there is no move."""
+        if all(cells):
+            return -1
+        self._reroot(cells)
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget else None
+        playouts = 0
+        while True:
+            self._iterate()
+            playouts += 1
+            if self.playouts and playouts >= self.playouts:
+                break
+            if deadline and time.perf_counter() >= deadline:
+                break
+        elapsed = time.perf_counter() - start
+        best = max(self.root.children, key=lambda ch: ch.visits)
+        self.last_stats = {
+            "playouts": playouts,
+            "seconds": round(elapsed, 4),
+            "playouts_per_second": round(playouts / elapsed) if elapsed else None,
+            "root_visits": self.root.visits,
+        }
+        # Keep the chosen subtree for the next move.
+        best.parent = None
+        self.root = best
+        self.cells[best.move] = MINE
+        self._take(self._empties, self._where, best.move)
+        self._near.discard(best.move)
+        self._near.update(nb for nb in self._neighbours[best.move] if not self.cells[nb])
+        return best.move
+
+    # PUBLIC_INTERFACE
+    def clone(self) -> "MCTSEngine":
+        """A new engine with the same settings and no tree."""
+        return MCTSEngine(self.size, self.k, self.playouts, self.time_budget, self.rollout_depth)
+
+    # PUBLIC_INTERFACE
+    def choose_for_board(self, board: List[List[Optional[str]]], symbol: str) -> Tuple[int, int]:
+        """choose() on a list-of-lists board. Returns (row, col), or (-1, -1)."""
+        cells = bytearray(
+            EMPTY if cell is None else (MINE if cell == symbol else THEIRS)
+            for row in board for cell in row
+        )
+        move = self.choose(cells)
+        if move < 0:
+            return -1, -1
+        return divmod(move, self.size)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Literal
+from typing import Annotated, List, Optional, Literal, Union
 from datetime import datetime
 
 
@@ -38,20 +38,24 @@ class GameStartRequest(BaseModel):
     """Request model to start a new game."""
     opponent_type: Literal["human", "ai"] = Field(..., description="Start a game with another user (human) or vs AI.")
     opponent_username: Optional[str] = Field(None, description="If human, the opponent's username.")
+    board_size: int = Field(3, ge=3, le=19, description="Board is board_size x board_size (3 for classic, 15 for gomoku).")
+    win_length: Optional[int] = Field(
+        None, ge=3, description="Marks in a row needed to win (k). Defaults to min(board_size, 5)."
+    )
 
 
 # PUBLIC_INTERFACE
 class GameBoard(BaseModel):
     """Model for game board state."""
-    board: List[List[Optional[str]]] = Field(..., description="3x3 tic-tac-toe board, values X, O, or None for each cell.")
+    board: List[List[Optional[str]]] = Field(..., description="NxN tic-tac-toe board, values X, O, or None for each cell.")
 
 
 # PUBLIC_INTERFACE
 class MoveRequest(BaseModel):
     """Request model for making a move."""
     game_id: int = Field(..., description="Game session ID.")
-    row: int = Field(..., ge=0, le=2, description="Row in board (0-2).")
-    col: int = Field(..., ge=0, le=2, description="Col in board (0-2).")
+    row: int = Field(..., ge=0, description="Row in board (0 to board_size - 1).")
+    col: int = Field(..., ge=0, description="Col in board (0 to board_size - 1).")
 
 
 # PUBLIC_INTERFACE
@@ -77,11 +81,14 @@ class GameHistoryItem(BaseModel):
 # PUBLIC_INTERFACE
 class GameHistoryResponse(BaseModel):
     history: List[GameHistoryItem]
+    next_cursor: Optional[int] = Field(None, description="Pass as `cursor` for the next (older) page; null on the last page.")
 
 
 # PUBLIC_INTERFACE
 class LeaderboardEntry(BaseModel):
+    rank: int
     username: str
+    rating: float
     wins: int
     losses: int
     draws: int
@@ -91,3 +98,34 @@ class LeaderboardEntry(BaseModel):
 # PUBLIC_INTERFACE
 class LeaderboardResponse(BaseModel):
     leaderboard: List[LeaderboardEntry]
+    total: int = Field(0, description="Number of ranked players.")
+    my_rank: Optional[int] = Field(None, description="Caller's rank, when around_me is set.")
+
+
+# PUBLIC_INTERFACE
+class PositionStatsEntry(BaseModel):
+    board: List[List[Optional[str]]] = Field(..., description="Canonical board of the symmetry class.")
+    count: int = Field(..., description="Times any board in this symmetry class was reached.")
+
+
+# PUBLIC_INTERFACE
+class PositionStatsResponse(BaseModel):
+    positions: List[PositionStatsEntry]
+
+
+# PUBLIC_INTERFACE
+class WSMoveFrame(BaseModel):
+    """Client frame on /ws/game: play a move as the user who connected."""
+    type: Literal["move"]
+    row: int = Field(..., ge=0)
+    col: int = Field(..., ge=0)
+    ref: Optional[str] = Field(None, description="Echoed in the error frame if this move is rejected.")
+
+
+# PUBLIC_INTERFACE
+class WSCommandFrame(BaseModel):
+    """Client frame on /ws/game: "ping" gets a pong, "state" the full current state."""
+    type: Literal["ping", "state"]
+
+
+WSClientFrame = Annotated[Union[WSMoveFrame, WSCommandFrame], Field(discriminator="type")]
@@ -0,0 +1,117 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# scrypt cost: 2**14 * 8 * 128 bytes = 16 MiB and a few tens of ms per hash.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+PREFIX = "scrypt"
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode()
+
+
+# Never matches a real password; login verifies against it when the email is unknown, so that case costs a
+# full scrypt run too and response times don't reveal which emails are registered.
+DUMMY_HASH = f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(bytes(SALT_BYTES))}${_b64(bytes(KEY_BYTES))}"
+
+
+# PUBLIC_INTERFACE
+def hash_password(password: str) -> str:
+    """Salted scrypt hash, stored as "scrypt$n$r$p$salt$key" so the parameters can change later."""
+    salt = os.urandom(SALT_BYTES)
+    key = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=KEY_BYTES)
+    return f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(key)}"
+
+
+# PUBLIC_INTERFACE
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against a hash_password() result or a legacy unsalted SHA-256 hex digest."""
+    if not stored.startswith(PREFIX + "$"):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored)
+    _, n, r, p, salt, key = stored.split("$")
+    expected = base64.b64decode(key)
+    actual = hashlib.scrypt(password.encode(), salt=base64.b64decode(salt), n=int(n), r=int(r), p=int(p),
+                            dklen=len(expected))
+    return hmac.compare_digest(actual, expected)
+
+
+# PUBLIC_INTERFACE
+def needs_rehash(stored: str) -> bool:
+    """True for legacy SHA-256 hashes and scrypt hashes made with other parameters."""
+    return not stored.startswith(f"{PREFIX}${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+
+# PUBLIC_INTERFACE
+class HasherBusyError(Exception):
+    """Raised when max_waiting KDF calls are already queued."""
+
+
+# PUBLIC_INTERFACE
+class PasswordHasher:
+    """Runs the KDF off the event loop, on at most `workers` threads.
+
+    hashlib.scrypt releases the GIL, so game requests keep being served
+    while hashes are computed. A login storm queues for those few threads
+    instead of taking over the process, and once `max_waiting` calls are
+    queued further ones fail fast with HasherBusyError.
+    """
+
+    def __init__(self, workers: int = 2, max_waiting: int = 256):
+        self.workers = workers
+        self.max_waiting = max_waiting
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="kdf")
+        return self._pool
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.workers + self.max_waiting:
+            self.rejected += 1
+            raise HasherBusyError()
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor(), fn, *args)
+        finally:
+            self._pending -= 1
+            self.completed += 1
+
+    # PUBLIC_INTERFACE
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    # PUBLIC_INTERFACE
+    async def verify(self, password: str, stored: str) -> bool:
+        return await self._run(verify_password, password, stored)
+
+    # PUBLIC_INTERFACE
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
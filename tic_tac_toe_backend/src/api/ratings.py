@@ -0,0 +1,150 @@
+from itertools import chain, islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_RATING = 1500.0
+DEFAULT_K_FACTOR = 32.0
+FIXED_RATINGS = {"AI": 1500.0}  # opponents whose rating never moves
+# batch_elo() probes each block of games; blocks whose first windows average
+# fewer games than this are cheaper to play one game at a time.
+BATCH_BLOCK = 65_536
+BATCH_PROBE_WINDOWS = 16
+BATCH_MIN_WINDOW = 128
+
+
+# PUBLIC_INTERFACE
+def expected_score(rating: float, opponent: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / 400.0))
+
+
+# PUBLIC_INTERFACE
+def elo_update(rating_a: float, rating_b: float, score_a: float, k: float = DEFAULT_K_FACTOR) -> Tuple[float, float]:
+    """New (rating_a, rating_b) after one game; score_a is 1 for an A win, 0.5 for a draw, 0 for a loss."""
+    delta = k * (score_a - expected_score(rating_a, rating_b))
+    return rating_a + delta, rating_b - delta
+
+
+# PUBLIC_INTERFACE
+def score_for(winner: Optional[str]) -> float:
+    """players[0]'s score given the winning symbol (X is players[0]); None is a draw."""
+    return 0.5 if winner is None else (1.0 if winner == "X" else 0.0)
+
+
+# PUBLIC_INTERFACE
+class GameArrays(NamedTuple):
+    names: List[str]  # player index -> name
+    a: np.ndarray  # (M,) int32: index of players[0]
+    b: np.ndarray  # (M,) int32: index of players[1]
+    score_a: np.ndarray  # (M,) float64
+
+
+# PUBLIC_INTERFACE
+def encode_games(games: Iterable[dict]) -> GameArrays:
+    """Turn finished-game dicts (players, winner), oldest first, into index arrays for batch_elo()."""
+    index: Dict[str, int] = {}
+    a: List[int] = []
+    b: List[int] = []
+    scores: List[float] = []
+    for game in games:
+        x, o = game["players"][0], game["players"][1]
+        a.append(index.setdefault(x, len(index)))
+        b.append(index.setdefault(o, len(index)))
+        scores.append(score_for(game["winner"]))
+    return GameArrays(list(index), np.array(a, dtype=np.int32), np.array(b, dtype=np.int32),
+                      np.array(scores, dtype=np.float64))
+
+
+def _previous_games(a: np.ndarray, b: np.ndarray, fixed: np.ndarray) -> np.ndarray:
+    """For each game, the index of the latest earlier game of either rated player (-1 if none)."""
+    m = len(a)
+    players = np.stack([a, b], axis=1).ravel()
+    games = np.repeat(np.arange(m, dtype=np.int64), 2)
+    # By player, then game. A unique int64 key sorts much faster than a stable sort on players.
+    order = np.argsort(players.astype(np.int64) * (2 * m) + np.arange(2 * m))
+    sorted_players, sorted_games = players[order], games[order]
+    prev_sorted = np.full(2 * m, -1, dtype=np.int64)
+    same = sorted_players[1:] == sorted_players[:-1]
+    prev_sorted[1:][same] = sorted_games[:-1][same]
+    prev = np.empty(2 * m, dtype=np.int64)
+    prev[order] = prev_sorted
+    prev[fixed[players]] = -1
+    prev_a, prev_b = prev[0::2], prev[1::2]
+    # Someone playing themselves: b's entry points at this same game; use a's instead.
+    prev_b = np.where(prev_b == np.arange(m), prev_a, prev_b)
+    return np.maximum(prev_a, prev_b)
+
+
+def _windows(prev: np.ndarray, start: int, stop: int, chunk: int = 256):
+    """Split games start..stop into consecutive runs in which no rated player appears twice.
+
+    Runs keep the original order, so applying them one after another gives
+    exactly the sequential result.
+    """
+    m = stop
+    while start < m:
+        end = start + 1
+        while end < m:
+            hi = min(m, end + chunk)
+            clash = np.flatnonzero(prev[end:hi] >= start)
+            if clash.size:
+                end += int(clash[0])
+                break
+            end = hi
+        yield start, end
+        start = end
+
+
+# PUBLIC_INTERFACE
+def batch_elo(games: GameArrays, k: float = DEFAULT_K_FACTOR, initial: float = DEFAULT_RATING) -> np.ndarray:
+    """Elo ratings after every game, in order, as an array indexed like games.names.
+
+    Same result as calling elo_update() game by game, but each run of
+    consecutive games with no rated player in common is one vectorised NumPy step.
+    A step only pays off for runs of a hundred or so games, i.e. many active
+    players; blocks of games whose runs are shorter are played one game at a
+    time instead, which with few players is what the whole history needs.
+    """
+    n = len(games.names)
+    ratings = np.full(n, initial, dtype=np.float64)
+    fixed = np.zeros(n, dtype=bool)
+    for i, name in enumerate(games.names):
+        if name in FIXED_RATINGS:
+            ratings[i] = FIXED_RATINGS[name]
+            fixed[i] = True
+    if len(games.a) == 0:
+        return ratings
+    pinned_at = np.flatnonzero(fixed)
+    pinned = ratings[pinned_at]
+    a, b, s = games.a, games.b, games.score_a
+    prev = _previous_games(a, b, fixed)
+    m, pos = len(a), 0
+    while pos < m:
+        end = min(m, pos + BATCH_BLOCK)
+        probe = list(islice(_windows(prev, pos, end), BATCH_PROBE_WINDOWS))
+        if probe[-1][1] < end and probe[-1][1] - pos < BATCH_MIN_WINDOW * len(probe):
+            _sequential_elo(ratings, fixed, a[pos:end], b[pos:end], s[pos:end], k)
+        else:
+            for lo, hi in chain(probe, _windows(prev, probe[-1][1], end)):
+                ga, gb = a[lo:hi], b[lo:hi]
+                ra, rb = ratings[ga], ratings[gb]
+                delta = k * (s[lo:hi] - 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0)))
+                ratings[ga] = ra + delta
+                ratings[gb] = rb - delta
+                ratings[pinned_at] = pinned
+        pos = end
+    return ratings
+
+
+def _sequential_elo(ratings: np.ndarray, fixed: np.ndarray, a: np.ndarray, b: np.ndarray, s: np.ndarray,
+                    k: float) -> None:
+    """elo_update() game by game on plain floats, in place; fixed ratings don't move."""
+    r, pinned = ratings.tolist(), fixed.tolist()
+    for x, o, score in zip(a.tolist(), b.tolist(), s.tolist()):
+        rx, ro = r[x], r[o]
+        delta = k * (score - 1.0 / (1.0 + 10.0 ** ((ro - rx) / 400.0)))
+        if not pinned[x]:
+            r[x] = rx + delta
+        if not pinned[o]:
+            r[o] = ro - delta
+    ratings[:] = r
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from .archive import ArchiveCache, ArchivedGame
+from .journal import EventJournal
+from .session import GameSession
+
+
+# PUBLIC_INTERFACE
+class SessionReaper:
+    """Background task that keeps the live game cache (sessions_db) bounded.
+
+    Every `interval` seconds it moves games that finished more than
+    `finished_ttl` seconds ago into the `archive` LRU as ArchivedGame records, and
+    drops unfinished games idle for `idle_ttl` seconds (abandoned games). Those
+    are only evicted, not archived: their events are in storage, so the next
+    request for one rebuilds it and play can resume.
+
+    The event journal is drained before anything is evicted, so a game is
+    never dropped while some of its events exist only in memory.
+    """
+
+    def __init__(self, sessions: Dict[int, GameSession], archive: ArchiveCache, journal: EventJournal,
+                 finished_ttl: float = 300.0, idle_ttl: float = 3600.0, interval: float = 30.0):
+        self.sessions = sessions
+        self.archive = archive
+        self.journal = journal
+        self.finished_ttl = finished_ttl
+        self.idle_ttl = idle_ttl
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.archived = 0
+        self.evicted_idle = 0
+        self.last_reap_seconds = 0.0
+
+    # PUBLIC_INTERFACE
+    async def start(self) -> None:
+        """Start the reaper loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    # PUBLIC_INTERFACE
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _expired(self, game_rec: GameSession, now: float) -> bool:
+        ttl = self.idle_ttl if game_rec.completed_at is None else self.finished_ttl
+        return now - game_rec.last_active >= ttl
+
+    # PUBLIC_INTERFACE
+    async def reap(self) -> int:
+        """One pass: archive or evict every expired game. Returns how many left sessions_db."""
+        start = time.perf_counter()
+        now = time.monotonic()
+        expired = [gid for gid, rec in self.sessions.items() if self._expired(rec, now)]
+        if not expired:
+            return 0
+        await self.journal.drain()
+        removed = 0
+        for gid in expired:
+            rec = self.sessions.get(gid)
+            # Skip games that saw new events while the journal was draining.
+            if rec is None or not self._expired(rec, now):
+                continue
+            del self.sessions[gid]
+            removed += 1
+            if rec.completed_at is None:
+                self.evicted_idle += 1
+            else:
+                self.archive.put(ArchivedGame.from_session(rec))
+                self.archived += 1
+        self.last_reap_seconds = time.perf_counter() - start
+        return removed
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap()
+            except Exception:
+                # Storage hiccup while draining: nothing was evicted, try again next tick.
+                pass
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> dict:
+        return {
+            "live_games": len(self.sessions),
+            "archived_games": len(self.archive),
+            "archived": self.archived,
+            "evicted_idle": self.evicted_idle,
+            "last_reap_seconds": round(self.last_reap_seconds, 6),
+        }
@@ -0,0 +1,258 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from .symmetry import canonicalize_bits, map_cell, unmap_cell
+
+# Scores are from the side to move. A win is worth WIN_SCORE minus the number of
+# marks on the board once it is made, so faster wins score higher. Heuristic
+# scores at the depth horizon always stay well below that range.
+WIN_SCORE = 1_000_000
+EXACT, LOWER, UPPER = 0, 1, 2
+DEFAULT_TABLE_SIZE = 200_000
+
+
+# PUBLIC_INTERFACE
+@lru_cache(maxsize=None)
+def line_masks(size: int, k: int) -> Tuple[int, ...]:
+    """Bitmasks of every k-in-a-row segment on a size x size board (row-major bits)."""
+    masks = []
+    for r in range(size):
+        for c in range(size):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                if 0 <= end_r < size and 0 <= end_c < size:
+                    mask = 0
+                    for i in range(k):
+                        mask |= 1 << ((r + dr * i) * size + c + dc * i)
+                    masks.append(mask)
+    return tuple(masks)
+
+
+# PUBLIC_INTERFACE
+@lru_cache(maxsize=None)
+def cell_lines(size: int, k: int) -> Tuple[Tuple[int, ...], ...]:
+    """For each cell, the segments from line_masks() that pass through it."""
+    masks = line_masks(size, k)
+    return tuple(tuple(m for m in masks if m >> cell & 1) for cell in range(size * size))
+
+
+@lru_cache(maxsize=None)
+def _move_order(size: int) -> Tuple[int, ...]:
+    """Cells sorted centre-first, which makes alpha-beta cut off much earlier."""
+    mid = (size - 1) / 2
+    return tuple(sorted(range(size * size), key=lambda i: abs(i // size - mid) + abs(i % size - mid)))
+
+
+class TTEntry(NamedTuple):
+    depth: int
+    score: int
+    flag: int
+    move: int
+
+
+# PUBLIC_INTERFACE
+class TranspositionTable:
+    """Bounded search cache shared by every game in the process.
+
+    Least recently used entries are evicted once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TABLE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, TTEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.probes = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[TTEntry]:
+        with self._lock:
+            self.probes += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: TTEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": round(self.hit_rate, 4),
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.probes = self.hits = self.evictions = 0
+
+
+# Process-wide table, shared across all games and searches.
+TRANSPOSITION_TABLE = TranspositionTable()
+_totals = {"searches": 0, "nodes": 0}
+
+
+# PUBLIC_INTERFACE
+class SearchResult(NamedTuple):
+    move: int  # cell index, -1 if the board is full or already won
+    score: int
+    nodes: int
+    tt_probes: int
+    tt_hits: int
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+
+class _Search:
+    def __init__(self, size: int, k: int, table: TranspositionTable):
+        self.size = size
+        self.k = k
+        self.full = (1 << (size * size)) - 1
+        self.lines = line_masks(size, k)
+        self.cell_lines = cell_lines(size, k)
+        self.order = _move_order(size)
+        self.table = table
+        self.nodes = 0
+        self.probes = 0
+        self.hits = 0
+
+    def key(self, mine: int, theirs: int) -> Tuple[tuple, int]:
+        """Table key of the position's symmetry class, plus the transform to reach it.
+
+        The side to move always owns `mine`, so the pair identifies the position.
+        """
+        cm, ct, t = canonicalize_bits(mine, theirs, self.size)
+        return (self.size, self.k, cm, ct), t
+
+    def heuristic(self, mine: int, theirs: int) -> int:
+        score = 0
+        for mask in self.lines:
+            m, t = mine & mask, theirs & mask
+            if not t and m:
+                score += m.bit_count() ** 2
+            elif not m and t:
+                score -= t.bit_count() ** 2
+        return score
+
+    def negamax(self, mine: int, theirs: int, depth: int, alpha: int, beta: int) -> Tuple[int, int]:
+        self.nodes += 1
+        occupied = mine | theirs
+        if occupied == self.full:
+            return 0, -1
+        if depth == 0:
+            return self.heuristic(mine, theirs), -1
+
+        key, t = self.key(mine, theirs)
+        self.probes += 1
+        entry = self.table.get(key)
+        tt_move = -1
+        if entry is not None:
+            self.hits += 1
+            # Stored moves are in the canonical frame.
+            tt_move = unmap_cell(entry.move, t, self.size) if entry.move >= 0 else -1
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score, tt_move
+                if entry.flag == LOWER:
+                    alpha = max(alpha, entry.score)
+                elif entry.flag == UPPER:
+                    beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score, tt_move
+
+        alpha_orig = alpha
+        marks_after = occupied.bit_count() + 1
+        best_score, best_move = -WIN_SCORE - 1, -1
+        order = self.order if tt_move < 0 else (tt_move,) + tuple(c for c in self.order if c != tt_move)
+        for cell in order:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            played = mine | bit
+            for mask in self.cell_lines[cell]:
+                if played & mask == mask:
+                    score = WIN_SCORE - marks_after
+                    break
+            else:
+                score = -self.negamax(theirs, played, depth - 1, -beta, -alpha)[0]
+            if score > best_score:
+                best_score, best_move = score, cell
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        stored_move = map_cell(best_move, t, self.size) if best_move >= 0 else -1
+        self.table.put(key, TTEntry(depth, best_score, flag, stored_move))
+        return best_score, best_move
+
+
+# PUBLIC_INTERFACE
+def search(mine: int, theirs: int, size: int = 3, k: int = 3, max_depth: Optional[int] = None,
+           table: TranspositionTable = TRANSPOSITION_TABLE) -> SearchResult:
+    """Negamax with alpha-beta pruning for the side owning `mine`.
+
+    Searches to the end of the game unless max_depth limits it, in which case
+    leaves are scored by counting open lines.
+    """
+    s = _Search(size, k, table)
+    if any(theirs & mask == mask for mask in s.lines):
+        return SearchResult(-1, -WIN_SCORE, 0, 0, 0)
+    empties = size * size - (mine | theirs).bit_count()
+    depth = empties if max_depth is None else min(max_depth, empties)
+    score, move = s.negamax(mine, theirs, depth, -WIN_SCORE - 1, WIN_SCORE + 1)
+    _totals["searches"] += 1
+    _totals["nodes"] += s.nodes
+    return SearchResult(move, score, s.nodes, s.probes, s.hits)
+
+
+# PUBLIC_INTERFACE
+def search_stats() -> dict:
+    """Cumulative search counters plus the shared transposition table's stats."""
+    return {**_totals, "transposition_table": TRANSPOSITION_TABLE.stats()}
+
+
+# PUBLIC_INTERFACE
+def search_board(board: List[List[Optional[str]]], symbol: str, k: Optional[int] = None,
+                 max_depth: Optional[int] = None) -> Tuple[Tuple[int, int], SearchResult]:
+    """Run search() on a list-of-lists board. Returns ((row, col), result); (-1, -1) if no move."""
+    size = len(board)
+    mine = theirs = 0
+    for r, row in enumerate(board):
+        for c, cell in enumerate(row):
+            if cell == symbol:
+                mine |= 1 << (r * size + c)
+            elif cell is not None:
+                theirs |= 1 << (r * size + c)
+    result = search(mine, theirs, size, k or size, max_depth)
+    if result.move < 0:
+        return (-1, -1), result
+    return divmod(result.move, size), result
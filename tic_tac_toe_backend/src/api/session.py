@@ -0,0 +1,59 @@
+import time
+from array import array
+from typing import Iterator, List, Optional, Tuple, Union
+
+from .bitboard import BitboardGame
+from .core import TicTacToeGame
+
+
+# PUBLIC_INTERFACE
+class GameSession:
+    """Live state of one game in sessions_db.
+
+    Slotted, and kept small because every live game has one: classic games
+    use the two-int BitboardGame engine, moves are cell indices
+    (row * size + col) in an array('B') (array('H') above 256 cells), and
+    timestamps are integer epoch microseconds (see archive.to_epoch_us).
+    Each move's symbol follows from its parity, X first.
+    """
+    __slots__ = (
+        "id", "game", "players", "is_ai", "moves", "created_at", "completed_at", "winner",
+        "seq", "snapshot_seq", "last_active", "mcts",
+    )
+
+    def __init__(self, game_id: int, game: Union[BitboardGame, TicTacToeGame], players: Tuple[str, ...],
+                 is_ai: bool, created_at: int):
+        self.id = game_id
+        self.game = game
+        self.players = players
+        self.is_ai = is_ai
+        self.moves = array("B" if game.size * game.size <= 256 else "H")
+        self.created_at = created_at
+        self.completed_at: Optional[int] = None
+        self.winner: Optional[str] = None
+        self.seq = 0  # events applied so far
+        self.snapshot_seq = 0  # events covered by the last snapshot
+        self.last_active = time.monotonic()  # for the reaper's TTLs
+        self.mcts = None  # per-game MCTSEngine, for AI games on large boards
+
+    @property
+    def size(self) -> int:
+        return self.game.size
+
+    @property
+    def moves_count(self) -> int:
+        return len(self.moves)
+
+    # PUBLIC_INTERFACE
+    def add_move(self, row: int, col: int) -> None:
+        self.moves.append(row * self.game.size + col)
+
+    # PUBLIC_INTERFACE
+    def positions(self) -> Iterator[Tuple[int, int]]:
+        """(row, col) of every move, in play order."""
+        size = self.game.size
+        return (divmod(cell, size) for cell in self.moves)
+
+    # PUBLIC_INTERFACE
+    def serialize_board(self) -> List[List[Optional[str]]]:
+        return self.game.serialize_board()
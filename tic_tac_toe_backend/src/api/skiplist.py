@@ -0,0 +1,124 @@
+import random
+from typing import Any, Iterator, List, Optional
+
+MAX_LEVEL = 24  # plenty for 2**24 keys at p = 1/2
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        # width[i]: how many positions next[i] is ahead of this node (the end counts as len + 1).
+        self.width = [1] * level
+
+
+# PUBLIC_INTERFACE
+class RankedSkipList:
+    """Sorted set of unique, comparable keys with positional access.
+
+    Each forward link records how many elements it skips, so besides
+    O(log n) insert/remove it answers "what is the index of this key" and
+    "which key is at index i" in O(log n); reading k keys from any index is
+    O(log n + k).
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._head = _Node(None, MAX_LEVEL)
+        self._size = 0
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.iter_from(0)
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._rng.random() < 0.5:
+            level += 1
+        return level
+
+    def _path(self, key: Any):
+        """Last node before `key` on every level, and its index (head is 0)."""
+        chain: List[_Node] = [self._head] * MAX_LEVEL
+        index = [0] * MAX_LEVEL
+        node, pos = self._head, 0
+        for level in reversed(range(MAX_LEVEL)):
+            nxt = node.next[level]
+            while nxt is not None and nxt.key < key:
+                pos += node.width[level]
+                node, nxt = nxt, nxt.next[level]
+            chain[level] = node
+            index[level] = pos
+        return chain, index
+
+    # PUBLIC_INTERFACE
+    def insert(self, key: Any) -> None:
+        """Add a key. Raises KeyError if it is already present."""
+        chain, index = self._path(key)
+        found = chain[0].next[0]
+        if found is not None and found.key == key:
+            raise KeyError(key)
+        pos = index[0] + 1  # the new node's index
+        new = _Node(key, self._random_level())
+        for level in range(len(new.next)):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = index[level] + prev.width[level] - pos + 1
+            prev.width[level] = pos - index[level]
+        for level in range(len(new.next), MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    # PUBLIC_INTERFACE
+    def remove(self, key: Any) -> None:
+        """Remove a key. Raises KeyError if it is missing."""
+        chain, _index = self._path(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(len(node.next)):
+            prev = chain[level]
+            prev.width[level] += node.width[level] - 1
+            prev.next[level] = node.next[level]
+        for level in range(len(node.next), MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    # PUBLIC_INTERFACE
+    def index(self, key: Any) -> int:
+        """0-based position of a key. Raises KeyError if it is missing."""
+        chain, index = self._path(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        return index[0]
+
+    def _node_at(self, i: int) -> Optional[_Node]:
+        remaining, node = i + 1, self._head
+        for level in reversed(range(MAX_LEVEL)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node if remaining == 0 and node is not self._head else None
+
+    # PUBLIC_INTERFACE
+    def iter_from(self, i: int) -> Iterator[Any]:
+        """Keys from 0-based position i onwards, in order."""
+        node = self._node_at(max(i, 0))
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    # PUBLIC_INTERFACE
+    def slice(self, offset: int, limit: int) -> List[Any]:
+        out = []
+        for key in self.iter_from(offset):
+            if len(out) >= limit:
+                break
+            out.append(key)
+        return out
@@ -0,0 +1,497 @@
+import bisect
+import json
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .events import AI_MOVE, MOVE, GameEvent
+from .user_store import DuplicateUserError, UserStore
+
+STORAGE_BACKENDS = ("memory", "sqlite")
+HISTORY_RESULTS = ("won", "lost", "draw", "ongoing")  # a game's result from one player's side
+NO_CURSOR = 2 ** 63 - 1  # "before" bound for the first page
+
+
+def _result_for(symbol: str, winner: Optional[str]) -> str:
+    return "draw" if winner is None else ("won" if winner == symbol else "lost")
+
+
+def _moves_per_game(events: List[GameEvent]) -> Dict[int, int]:
+    counts: Dict[int, int] = {}
+    for event in events:
+        if event.kind in (MOVE, AI_MOVE):
+            counts[event.game_id] = counts.get(event.game_id, 0) + 1
+    return counts
+
+
+# PUBLIC_INTERFACE
+class DuplicateEventError(Exception):
+    """Raised by write_events when an event's (game_id, seq) is already stored, e.g. by another worker."""
+
+
+# PUBLIC_INTERFACE
+class StorageBackend(ABC):
+    """Persistent store for users, game metadata, game event logs and per-user game lists.
+
+    Games are dicts with id, players, is_ai, size, k, created_at, completed_at,
+    winner and moves_count; they are a queryable summary of each game's
+    events.GameEvent log. Live game objects are not stored; they are rebuilt
+    from the latest snapshot plus the events after it.
+
+    Game ids are handed out in start order, so each player's history is
+    indexed by (user_id, game_id), with extra indexes by opponent and result.
+    """
+
+    blocking = True  # calls do I/O, so async code runs them in a thread
+
+    @abstractmethod
+    def add_user(self, email: str, username: str, password_hash: str) -> dict:
+        """Create a user and return its record. Raises DuplicateUserError."""
+
+    @abstractmethod
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_user_by_username(self, username: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def get_user_by_id(self, user_id: int) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        """Replace a user's stored hash, e.g. when upgrading it to a stronger KDF."""
+
+    @abstractmethod
+    def create_game(self, players: List[str], player_ids: List[int], is_ai: bool, size: int, k: int,
+                    created_at: datetime) -> int:
+        """Store a new game, link it to each player id, and return its id."""
+
+    @abstractmethod
+    def get_game(self, game_id: int) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def write_events(self, events: List[GameEvent], snapshots: List[dict]) -> None:
+        """Append events to their games' logs and replace the games' snapshots.
+
+        Each snapshot is an events.take_snapshot() dict plus its "game_id".
+        Move events also count towards their game's moves_count, so history
+        pages show ongoing games' progress without replaying them. All or
+        nothing; raises DuplicateEventError if any seq is already taken.
+        """
+
+    @abstractmethod
+    def get_events(self, game_id: int, since: int = 0) -> List[GameEvent]:
+        """Events of a game with seq >= `since`, in order."""
+
+    @abstractmethod
+    def get_snapshot(self, game_id: int) -> Optional[dict]:
+        """Latest snapshot of a game, if one was written."""
+
+    @abstractmethod
+    def unfinished_game_ids(self) -> List[int]:
+        ...
+
+    @abstractmethod
+    def finish_game(self, game_id: int, winner: Optional[str], completed_at: datetime) -> None:
+        """Record the result; each player's history entry gets won/lost/draw.
+
+        moves_count comes from write_events; the last moves may still be in the journal.
+        """
+
+    @abstractmethod
+    def user_games_page(self, user_id: int, before: Optional[int] = None, limit: int = 20,
+                        result: Optional[str] = None, opponent: Optional[str] = None) -> List[dict]:
+        """Up to `limit` of the user's games with id < `before`, newest first.
+
+        `result` (one of HISTORY_RESULTS, from this user's side) and `opponent`
+        narrow the page; either way a page costs O(log n + limit).
+        """
+
+    @abstractmethod
+    def finished_games(self) -> Iterator[dict]:
+        """Every finished game, in completion order. Used to rebuild the leaderboard."""
+
+    def close(self) -> None:
+        pass
+
+
+# PUBLIC_INTERFACE
+class MemoryStorage(StorageBackend):
+    """Process-local dicts. Nothing survives a restart; meant for tests and demos."""
+
+    blocking = False
+
+    def __init__(self):
+        self.users = UserStore()
+        self.games: Dict[int, dict] = {}
+        self.events: Dict[int, List[GameEvent]] = {}
+        self.snapshots: Dict[int, dict] = {}
+        # Ascending game ids per user, and per (user, "opponent", name), (user, "result", result) and
+        # (user, "result:" + result, opponent name).
+        self.user_games: Dict[int, List[int]] = {}
+        self._history_index: Dict[Tuple[int, str, str], List[int]] = {}
+        self._members: Dict[int, List[Tuple[int, str]]] = {}  # game id: [(user id, symbol)]
+        self._opponents: Dict[Tuple[int, int], str] = {}  # (user id, game id): opponent
+        self._lock = threading.Lock()
+        self._next_game_id = 1
+
+    def add_user(self, email: str, username: str, password_hash: str) -> dict:
+        return self.users.add(email, username, password_hash)
+
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        return self.users.get_by_email(email)
+
+    def get_user_by_username(self, username: str) -> Optional[dict]:
+        return self.users.get_by_username(username)
+
+    def get_user_by_id(self, user_id: int) -> Optional[dict]:
+        return self.users.get_by_id(user_id)
+
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        self.users.set_password_hash(user_id, password_hash)
+
+    def create_game(self, players: List[str], player_ids: List[int], is_ai: bool, size: int, k: int,
+                    created_at: datetime) -> int:
+        with self._lock:
+            gid = self._next_game_id
+            self._next_game_id += 1
+            self.games[gid] = {
+                "id": gid, "players": list(players), "is_ai": is_ai, "size": size, "k": k,
+                "created_at": created_at, "completed_at": None, "winner": None, "moves_count": 0,
+            }
+            self.events[gid] = []
+            members = self._members[gid] = []
+            for i, uid in enumerate(player_ids):
+                if any(uid == member for member, _ in members):
+                    continue  # playing yourself
+                members.append((uid, "XO"[i]))
+                opponent = players[1 - i]
+                self._opponents[(uid, gid)] = opponent
+                self.user_games.setdefault(uid, []).append(gid)
+                self._history_index.setdefault((uid, "opponent", opponent), []).append(gid)
+                self._history_index.setdefault((uid, "result", "ongoing"), []).append(gid)
+                self._history_index.setdefault((uid, "result:ongoing", opponent), []).append(gid)
+        return gid
+
+    def get_game(self, game_id: int) -> Optional[dict]:
+        game = self.games.get(game_id)
+        return dict(game) if game else None
+
+    def write_events(self, events: List[GameEvent], snapshots: List[dict]) -> None:
+        with self._lock:
+            lengths: Dict[int, int] = {}
+            # get_events() slices by position, so each game's log must stay contiguous from seq 0.
+            for event in events:
+                stored = lengths.get(event.game_id, len(self.events[event.game_id]))
+                if event.seq < stored:
+                    raise DuplicateEventError(f"game {event.game_id} already has event {event.seq}")
+                if event.seq > stored:
+                    raise ValueError(f"game {event.game_id} has no event {stored} to follow with {event.seq}")
+                lengths[event.game_id] = stored + 1
+            for event in events:
+                self.events[event.game_id].append(event)
+            for gid, moves in _moves_per_game(events).items():
+                self.games[gid]["moves_count"] += moves
+            for snapshot in snapshots:
+                self.snapshots[snapshot["game_id"]] = snapshot
+
+    def get_events(self, game_id: int, since: int = 0) -> List[GameEvent]:
+        # seq numbers are contiguous from 0, so they double as list positions.
+        return self.events.get(game_id, [])[since:]
+
+    def get_snapshot(self, game_id: int) -> Optional[dict]:
+        return self.snapshots.get(game_id)
+
+    def unfinished_game_ids(self) -> List[int]:
+        return [gid for gid, game in self.games.items() if game["completed_at"] is None]
+
+    def finish_game(self, game_id: int, winner: Optional[str], completed_at: datetime) -> None:
+        with self._lock:
+            self.games[game_id].update(winner=winner, completed_at=completed_at)
+            for uid, symbol in self._members.get(game_id, []):
+                result, opponent = _result_for(symbol, winner), self._opponents[(uid, game_id)]
+                for old, new in (((uid, "result", "ongoing"), (uid, "result", result)),
+                                 ((uid, "result:ongoing", opponent), (uid, "result:" + result, opponent))):
+                    ids = self._history_index[old]
+                    i = bisect.bisect_left(ids, game_id)
+                    if i < len(ids) and ids[i] == game_id:
+                        del ids[i]
+                    bisect.insort(self._history_index.setdefault(new, []), game_id)
+
+    def user_games_page(self, user_id: int, before: Optional[int] = None, limit: int = 20,
+                        result: Optional[str] = None, opponent: Optional[str] = None) -> List[dict]:
+        if result is not None and opponent is not None:
+            ids = self._history_index.get((user_id, "result:" + result, opponent), [])
+        elif result is not None:
+            ids = self._history_index.get((user_id, "result", result), [])
+        elif opponent is not None:
+            ids = self._history_index.get((user_id, "opponent", opponent), [])
+        else:
+            ids = self.user_games.get(user_id, [])
+        page: List[dict] = []
+        for i in range(bisect.bisect_left(ids, NO_CURSOR if before is None else before) - 1, -1, -1):
+            if len(page) == limit:
+                break
+            page.append(dict(self.games[ids[i]]))
+        return page
+
+    def finished_games(self) -> Iterator[dict]:
+        done = [game for game in self.games.values() if game["completed_at"] is not None]
+        return iter(sorted(done, key=lambda game: (game["completed_at"], game["id"])))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL,
+    username TEXT NOT NULL,
+    password_hash TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    players TEXT NOT NULL,
+    is_ai INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    k INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    completed_at TEXT,
+    winner TEXT,
+    moves_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS user_games (
+    user_id INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    result TEXT NOT NULL DEFAULT 'ongoing',
+    PRIMARY KEY (user_id, game_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS user_games_by_opponent ON user_games (user_id, opponent, game_id);
+CREATE INDEX IF NOT EXISTS user_games_by_result ON user_games (user_id, result, game_id);
+CREATE INDEX IF NOT EXISTS user_games_by_result_opponent ON user_games (user_id, result, opponent, game_id);
+CREATE INDEX IF NOT EXISTS user_games_by_game ON user_games (game_id);
+CREATE INDEX IF NOT EXISTS games_unfinished ON games (id) WHERE completed_at IS NULL;
+CREATE TABLE IF NOT EXISTS events (
+    game_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    game_id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+# Fixed SQL text with ? parameters: each pooled connection compiles these once
+# and reuses them from its statement cache.
+_INSERT_USER = "INSERT INTO users (email, username, password_hash) VALUES (?, ?, ?)"
+_USER_BY_EMAIL = "SELECT id, username, email, password_hash FROM users WHERE email = ?"
+_USER_BY_USERNAME = "SELECT id, username, email, password_hash FROM users WHERE username = ?"
+_USER_BY_ID = "SELECT id, username, email, password_hash FROM users WHERE id = ?"
+_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+_INSERT_GAME = "INSERT INTO games (players, is_ai, size, k, created_at) VALUES (?, ?, ?, ?, ?)"
+_INSERT_USER_GAME = "INSERT OR IGNORE INTO user_games (user_id, game_id, symbol, opponent) VALUES (?, ?, ?, ?)"
+_GAME_COLUMNS = "id, players, is_ai, size, k, created_at, completed_at, winner, moves_count"
+_GAME_BY_ID = f"SELECT {_GAME_COLUMNS} FROM games WHERE id = ?"
+_INSERT_EVENT = "INSERT INTO events (game_id, seq, kind, data) VALUES (?, ?, ?, ?)"
+_ADD_MOVES = "UPDATE games SET moves_count = moves_count + ? WHERE id = ?"
+_EVENTS_SINCE = "SELECT game_id, seq, kind, data FROM events WHERE game_id = ? AND seq >= ? ORDER BY seq"
+_UPSERT_SNAPSHOT = "INSERT OR REPLACE INTO snapshots (game_id, seq, state) VALUES (?, ?, ?)"
+_SNAPSHOT_BY_GAME = "SELECT state FROM snapshots WHERE game_id = ?"
+_UNFINISHED_GAME_IDS = "SELECT id FROM games WHERE completed_at IS NULL"
+_FINISH_GAME = "UPDATE games SET winner = ?, completed_at = ? WHERE id = ?"
+_FINISH_USER_GAMES = (
+    "UPDATE user_games SET result = CASE WHEN ?1 IS NULL THEN 'draw' WHEN symbol = ?1 THEN 'won' ELSE 'lost' END"
+    " WHERE game_id = ?2"
+)
+_FINISHED_GAMES = f"SELECT {_GAME_COLUMNS} FROM games WHERE completed_at IS NOT NULL ORDER BY completed_at, id"
+# One statement per filter combination; each walks one user_games index backwards from the cursor.
+_USER_GAMES_PAGE = {
+    (has_result, has_opponent): (
+        "SELECT " + ", ".join(f"g.{c}" for c in _GAME_COLUMNS.split(", "))
+        + " FROM user_games ug JOIN games g ON g.id = ug.game_id WHERE ug.user_id = ?"
+        + (" AND ug.result = ?" if has_result else "")
+        + (" AND ug.opponent = ?" if has_opponent else "")
+        + " AND ug.game_id < ? ORDER BY ug.game_id DESC LIMIT ?"
+    )
+    for has_result in (False, True) for has_opponent in (False, True)
+}
+
+
+# PUBLIC_INTERFACE
+class SQLiteStorage(StorageBackend):
+    """SQLite in WAL mode behind a small pool of connections.
+
+    WAL lets readers run alongside the single writer, so several uvicorn
+    workers can share one database file.
+    """
+
+    def __init__(self, path: str = "tictactoe.db", pool_size: int = 4):
+        self.path = path
+        if path == ":memory:":
+            pool_size = 1  # every connection would otherwise get its own empty database
+        self.pool_size = pool_size
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._opened = 0
+        self._open_lock = threading.Lock()
+        self._pool.put(self._connect())
+        self._opened = 1
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=64)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Reuse an idle connection, open a new one below pool_size, else wait for one."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            if self._opened < self.pool_size:
+                self._opened += 1
+                return self._connect()
+        return self._pool.get()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _user(self, sql: str, key) -> Optional[dict]:
+        with self._connection() as conn:
+            row = conn.execute(sql, (key,)).fetchone()
+        return dict(row) if row else None
+
+    def add_user(self, email: str, username: str, password_hash: str) -> dict:
+        try:
+            with self._connection() as conn:
+                cur = conn.execute(_INSERT_USER, (email, username, password_hash))
+        except sqlite3.IntegrityError as e:
+            raise DuplicateUserError("email" if "email" in str(e) else "username")
+        return {"id": cur.lastrowid, "username": username, "email": email, "password_hash": password_hash}
+
+    def get_user_by_email(self, email: str) -> Optional[dict]:
+        return self._user(_USER_BY_EMAIL, email)
+
+    def get_user_by_username(self, username: str) -> Optional[dict]:
+        return self._user(_USER_BY_USERNAME, username)
+
+    def get_user_by_id(self, user_id: int) -> Optional[dict]:
+        return self._user(_USER_BY_ID, user_id)
+
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        with self._connection() as conn:
+            conn.execute(_UPDATE_PASSWORD_HASH, (password_hash, user_id))
+
+    def create_game(self, players: List[str], player_ids: List[int], is_ai: bool, size: int, k: int,
+                    created_at: datetime) -> int:
+        with self._connection() as conn:
+            cur = conn.execute(_INSERT_GAME, (json.dumps(players), int(is_ai), size, k, created_at.isoformat()))
+            gid = cur.lastrowid
+            conn.executemany(_INSERT_USER_GAME, [
+                (uid, gid, "XO"[i], players[1 - i]) for i, uid in enumerate(player_ids)
+            ])
+        return gid
+
+    def get_game(self, game_id: int) -> Optional[dict]:
+        with self._connection() as conn:
+            row = conn.execute(_GAME_BY_ID, (game_id,)).fetchone()
+        return None if row is None else self._game(row)
+
+    @staticmethod
+    def _game(row: sqlite3.Row) -> dict:
+        game = dict(row)
+        game["players"] = json.loads(game["players"])
+        game["is_ai"] = bool(game["is_ai"])
+        game["created_at"] = datetime.fromisoformat(game["created_at"])
+        if game["completed_at"]:
+            game["completed_at"] = datetime.fromisoformat(game["completed_at"])
+        return game
+
+    def write_events(self, events: List[GameEvent], snapshots: List[dict]) -> None:
+        """Everything in one transaction."""
+        try:
+            with self._connection() as conn:
+                conn.executemany(_INSERT_EVENT, [(e.game_id, e.seq, e.kind, json.dumps(e.data)) for e in events])
+                conn.executemany(_ADD_MOVES, [(moves, gid) for gid, moves in _moves_per_game(events).items()])
+                conn.executemany(_UPSERT_SNAPSHOT, [(s["game_id"], s["seq"], json.dumps(s)) for s in snapshots])
+        except sqlite3.IntegrityError as e:
+            raise DuplicateEventError(str(e))
+
+    def get_events(self, game_id: int, since: int = 0) -> List[GameEvent]:
+        with self._connection() as conn:
+            rows = conn.execute(_EVENTS_SINCE, (game_id, since)).fetchall()
+        return [GameEvent(row[0], row[1], row[2], json.loads(row[3])) for row in rows]
+
+    def get_snapshot(self, game_id: int) -> Optional[dict]:
+        with self._connection() as conn:
+            row = conn.execute(_SNAPSHOT_BY_GAME, (game_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def unfinished_game_ids(self) -> List[int]:
+        with self._connection() as conn:
+            return [row[0] for row in conn.execute(_UNFINISHED_GAME_IDS)]
+
+    def finish_game(self, game_id: int, winner: Optional[str], completed_at: datetime) -> None:
+        with self._connection() as conn:
+            conn.execute(_FINISH_GAME, (winner, completed_at.isoformat(), game_id))
+            conn.execute(_FINISH_USER_GAMES, (winner, game_id))
+
+    def user_games_page(self, user_id: int, before: Optional[int] = None, limit: int = 20,
+                        result: Optional[str] = None, opponent: Optional[str] = None) -> List[dict]:
+        params = [user_id] + [v for v in (result, opponent) if v is not None]
+        params += [NO_CURSOR if before is None else before, limit]
+        sql = _USER_GAMES_PAGE[(result is not None, opponent is not None)]
+        with self._connection() as conn:
+            return [self._game(row) for row in conn.execute(sql, params)]
+
+    def finished_games(self) -> Iterator[dict]:
+        """Streams rows in chunks, holding one pooled connection until exhausted."""
+        with self._connection() as conn:
+            cur = conn.execute(_FINISHED_GAMES)
+            while True:
+                rows = cur.fetchmany(10_000)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._game(row)
+
+    def close(self) -> None:
+        """Close idle connections; later calls open fresh ones."""
+        with self._open_lock:
+            while not self._pool.empty():
+                self._pool.get_nowait().close()
+                self._opened -= 1
+
+
+# PUBLIC_INTERFACE
+def create_storage(backend: str = "memory", sqlite_path: str = "tictactoe.db", pool_size: int = 4) -> StorageBackend:
+    """Build the configured storage backend."""
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "sqlite":
+        return SQLiteStorage(sqlite_path, pool_size)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,139 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# The 8 symmetries of a square board (the dihedral group D4), as (row, col) maps.
+# Transform 0 is the identity.
+TRANSFORM_NAMES = (
+    "identity", "rot90", "rot180", "rot270", "flip_h", "flip_v", "transpose", "anti_transpose",
+)
+_COORD_MAPS = (
+    lambda r, c, n: (r, c),
+    lambda r, c, n: (c, n - 1 - r),
+    lambda r, c, n: (n - 1 - r, n - 1 - c),
+    lambda r, c, n: (n - 1 - c, r),
+    lambda r, c, n: (r, n - 1 - c),
+    lambda r, c, n: (n - 1 - r, c),
+    lambda r, c, n: (c, r),
+    lambda r, c, n: (n - 1 - c, n - 1 - r),
+)
+IDENTITY = 0
+
+
+# PUBLIC_INTERFACE
+@lru_cache(maxsize=None)
+def permutations(size: int = 3) -> Tuple[Tuple[int, ...], ...]:
+    """perm[t][i] is the cell that cell i lands on under transform t (row-major indices)."""
+    perms = []
+    for fn in _COORD_MAPS:
+        perm = []
+        for i in range(size * size):
+            r, c = fn(i // size, i % size, size)
+            perm.append(r * size + c)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+# PUBLIC_INTERFACE
+@lru_cache(maxsize=None)
+def inverses(size: int = 3) -> Tuple[int, ...]:
+    """inverses()[t] is the transform that undoes t."""
+    perms = permutations(size)
+    cells = range(size * size)
+    return tuple(
+        next(u for u, q in enumerate(perms) if all(q[p[i]] == i for i in cells))
+        for p in perms
+    )
+
+
+def _chunk_bits(size: int) -> int:
+    # A 3x3 board fits one 512-entry table per transform; bigger boards go byte by byte.
+    return 9 if size == 3 else 8
+
+
+@lru_cache(maxsize=None)
+def _chunk_tables(size: int) -> Tuple[Tuple[Tuple[int, ...], ...], ...]:
+    """tables[t][chunk][value]: the transformed bits contributed by one chunk of the board."""
+    width = _chunk_bits(size)
+    cells = size * size
+    chunks = (cells + width - 1) // width
+    tables = []
+    for perm in permutations(size):
+        per_chunk = []
+        for chunk in range(chunks):
+            base = chunk * width
+            table = []
+            for value in range(1 << width):
+                out = 0
+                for j in range(width):
+                    if value >> j & 1 and base + j < cells:
+                        out |= 1 << perm[base + j]
+                table.append(out)
+            per_chunk.append(tuple(table))
+        tables.append(tuple(per_chunk))
+    return tuple(tables)
+
+
+# PUBLIC_INTERFACE
+def transform_bits(bits: int, t: int, size: int = 3) -> int:
+    """Apply transform t to a row-major bitboard."""
+    width = _chunk_bits(size)
+    low = (1 << width) - 1
+    out = 0
+    for table in _chunk_tables(size)[t]:
+        out |= table[bits & low]
+        bits >>= width
+    return out
+
+
+# PUBLIC_INTERFACE
+def canonicalize_bits(a: int, b: int, size: int = 3) -> Tuple[int, int, int]:
+    """Canonical form of the position (a, b) and the transform that produced it.
+
+    The canonical form is the smallest (a, b) pair over all 8 transforms, so all
+    boards in one symmetry class share it. Returns (a', b', t).
+    """
+    best = (a, b, IDENTITY)
+    for t in range(1, 8):
+        ta = transform_bits(a, t, size)
+        if ta > best[0]:
+            continue
+        tb = transform_bits(b, t, size)
+        if (ta, tb) < best[:2]:
+            best = (ta, tb, t)
+    return best
+
+
+# PUBLIC_INTERFACE
+def map_cell(cell: int, t: int, size: int = 3) -> int:
+    """Where `cell` of the original board lands on the transformed board."""
+    return permutations(size)[t][cell]
+
+
+# PUBLIC_INTERFACE
+def unmap_cell(cell: int, t: int, size: int = 3) -> int:
+    """Map a cell on the transformed board back through the inverse transform."""
+    return permutations(size)[inverses(size)[t]][cell]
+
+
+# PUBLIC_INTERFACE
+def canonicalize(board: List[List[Optional[str]]], x: str = "X", o: str = "O") -> Tuple[List[List[Optional[str]]], int]:
+    """Canonical form of a serialize_board()-style board plus the transform applied.
+
+    Map a move chosen on the canonical board back with unmap_cell(cell, t, len(board)).
+    """
+    size = len(board)
+    x_bits = o_bits = 0
+    for r, row in enumerate(board):
+        for c, cell in enumerate(row):
+            if cell == x:
+                x_bits |= 1 << (r * size + c)
+            elif cell == o:
+                o_bits |= 1 << (r * size + c)
+    cx, co, t = canonicalize_bits(x_bits, o_bits, size)
+    out: List[List[Optional[str]]] = []
+    for r in range(size):
+        out.append([
+            x if cx >> (r * size + c) & 1 else (o if co >> (r * size + c) & 1 else None)
+            for c in range(size)
+        ])
+    return out, t
@@ -0,0 +1,70 @@
+import threading
+from typing import Dict, Optional
+
+
+# PUBLIC_INTERFACE
+class DuplicateUserError(Exception):
+    """Raised when an email or username is already registered. `field` says which."""
+
+    def __init__(self, field: str):
+        super().__init__(f"{field} already registered")
+        self.field = field
+
+
+# PUBLIC_INTERFACE
+class UserStore:
+    """In-memory users with O(1) lookups by email, username and id.
+
+    All three indexes point at the same user dict and are updated together
+    under one lock, so a registration is either fully visible or not at all.
+    """
+
+    def __init__(self):
+        self._by_email: Dict[str, dict] = {}
+        self._by_username: Dict[str, dict] = {}
+        self._by_id: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, email: str) -> bool:
+        return email in self._by_email
+
+    # PUBLIC_INTERFACE
+    def add(self, email: str, username: str, password_hash: str) -> dict:
+        """Register a user and return its record. Raises DuplicateUserError."""
+        with self._lock:
+            if email in self._by_email:
+                raise DuplicateUserError("email")
+            if username in self._by_username:
+                raise DuplicateUserError("username")
+            user = {
+                "id": self._next_id,
+                "username": username,
+                "email": email,
+                "password_hash": password_hash,
+            }
+            self._next_id += 1
+            self._by_email[email] = user
+            self._by_username[username] = user
+            self._by_id[user["id"]] = user
+            return user
+
+    # PUBLIC_INTERFACE
+    def set_password_hash(self, user_id: int, password_hash: str) -> None:
+        with self._lock:
+            self._by_id[user_id]["password_hash"] = password_hash
+
+    # PUBLIC_INTERFACE
+    def get_by_email(self, email: str) -> Optional[dict]:
+        return self._by_email.get(email)
+
+    # PUBLIC_INTERFACE
+    def get_by_username(self, username: str) -> Optional[dict]:
+        return self._by_username.get(username)
+
+    # PUBLIC_INTERFACE
+    def get_by_id(self, user_id: int) -> Optional[dict]:
+        return self._by_id.get(user_id)
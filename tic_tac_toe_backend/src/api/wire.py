@@ -0,0 +1,105 @@
+# Binary frame format for /ws/game, negotiated as the "ttt.bin.v1" subprotocol.
+#
+# Server frames start with one header byte:
+#
+#     bits 7-6  kind: 0 state, 1 delta
+#     bits 5-4  status: 0 continue, 1 X won, 2 O won, 3 draw
+#     bit  3    next turn: 0 X, 1 O (0 once the game is over)
+#     bit  2    state frames only: a board-size byte follows (boards other than 3x3)
+#
+# A state frame then holds the X mask OR'ed with the O mask shifted left by
+# size*size, little-endian, in ceil(2 * size * size / 8) bytes; bit i is cell
+# i = row * size + col. A 3x3 state is 4 bytes. A delta frame holds the moves
+# one request added (the player's, then the AI's reply if any), each a
+# little-endian uint16 of cell index | symbol << 15 (0 X, 1 O).
+#
+# Clients send a move as a 2-byte little-endian uint16 cell index. Errors and
+# pongs stay JSON text frames, as in the JSON protocol.
+
+from typing import List, Optional, Sequence, Tuple
+
+SUBPROTOCOL = "ttt.bin.v1"
+JSON = "json"  # codec names, as GameBroadcaster subscribers carry them
+BINARY = "binary"
+
+STATE = 0
+DELTA = 1
+_STATUS = {None: 0, "X": 1, "O": 2}
+_WINNER = {1: "X", 2: "O"}
+SIZED = 0x04
+
+
+def _header(kind: int, winner: Optional[str], draw: bool, next_turn: Optional[str]) -> int:
+    status = 3 if draw and winner is None else _STATUS[winner]
+    return kind << 6 | status << 4 | (next_turn == "O") << 3
+
+
+# PUBLIC_INTERFACE
+def encode_state(size: int, cells: Sequence[int], winner: Optional[str], draw: bool) -> bytes:
+    """A state frame from the cells played so far, in order (X first, so symbols follow from parity)."""
+    x = o = 0
+    for cell in cells[0::2]:
+        x |= 1 << cell
+    for cell in cells[1::2]:
+        o |= 1 << cell
+    finished = winner is not None or draw
+    next_turn = None if finished else "XO"[len(cells) % 2]
+    header = _header(STATE, winner, draw, next_turn)
+    area = size * size
+    body = (x | o << area).to_bytes((2 * area + 7) // 8, "little")
+    if size == 3:
+        return bytes((header,)) + body
+    return bytes((header | SIZED, size)) + body
+
+
+# PUBLIC_INTERFACE
+def encode_delta(size: int, moves: Sequence[Tuple[int, int, str]], winner: Optional[str], draw: bool,
+                 next_turn: Optional[str]) -> bytes:
+    frame = bytearray((_header(DELTA, winner, draw, next_turn),))
+    for row, col, symbol in moves:
+        frame += ((row * size + col) | (symbol == "O") << 15).to_bytes(2, "little")
+    return bytes(frame)
+
+
+# PUBLIC_INTERFACE
+def decode_move(frame: bytes, size: int) -> Optional[Tuple[int, int]]:
+    """(row, col) from a client move frame, or None if it is malformed or off the board."""
+    if len(frame) != 2:
+        return None
+    cell = int.from_bytes(frame, "little")
+    return divmod(cell, size) if cell < size * size else None
+
+
+# PUBLIC_INTERFACE
+def decode_frame(frame: bytes, size: int = 3) -> dict:
+    """Server frame back to a dict shaped like the JSON protocol's; for clients, tests and benchmarks.
+
+    `size` is only needed for deltas, which don't carry it.
+    """
+    header = frame[0]
+    kind, status = header >> 6, header >> 4 & 3
+    finished = status != 0
+    decoded = {
+        "type": "state" if kind == STATE else "delta",
+        "next_turn": None if finished else "XO"[header >> 3 & 1],
+        "winner": _WINNER.get(status),
+        "status": ("continue", "won", "won", "draw")[status],
+    }
+    if kind == STATE:
+        body = frame[1:]
+        if header & SIZED:
+            size, body = body[0], body[1:]
+        bits = int.from_bytes(body, "little")
+        area = size * size
+        cells: List[Optional[str]] = [
+            "X" if bits >> i & 1 else ("O" if bits >> (area + i) & 1 else None) for i in range(area)
+        ]
+        decoded["board"] = [cells[r * size:(r + 1) * size] for r in range(size)]
+    else:
+        moves = []
+        for i in range(1, len(frame), 2):
+            packed = int.from_bytes(frame[i:i + 2], "little")
+            row, col = divmod(packed & 0x7FFF, size)
+            moves.append([row, col, "O" if packed >> 15 else "X"])
+        decoded["moves"] = moves
+    return decoded
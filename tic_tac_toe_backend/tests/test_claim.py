@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.api import main as api
+from src.api.events import CREATED, MOVE, GameEvent
+
+
+def start_game() -> int:
+    created_at = datetime(2024, 1, 1)
+    gid = api.storage.create_game(["alice", "bob"], [1, 2], False, 3, 3, created_at)
+    game_rec = api.session_record(gid, api.new_game(), ["alice", "bob"], False, created_at)
+    api.sessions_db[gid] = game_rec
+    asyncio.run(api.record_event(game_rec, CREATED, {
+        "players": ["alice", "bob"], "is_ai": False, "size": 3, "k": 3, "created_at": created_at.isoformat(),
+    }))
+    return gid
+
+
+def move(gid: int, row: int, col: int) -> None:
+    game_rec = api.sessions_db[gid]
+    asyncio.run(api.record_event(game_rec, MOVE, {"player": "alice", "row": row, "col": col, "symbol": "X"}))
+
+
+@pytest.fixture(autouse=True)
+def claim_events(monkeypatch):
+    monkeypatch.setattr(api, "CLAIM_EVENTS", True)
+
+
+def test_failed_claim_drops_the_cached_game(monkeypatch):
+    gid = start_game()
+
+    def unavailable(events, snapshots):
+        raise OSError("database is locked")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(api.storage, "write_events", unavailable)
+        with pytest.raises(OSError):
+            move(gid, 1, 1)
+    assert gid not in api.sessions_db
+
+    game_rec = asyncio.run(api.load_session(gid))
+    assert game_rec.seq == 1 and game_rec.moves_count == 0
+    move(gid, 0, 0)
+    assert [e.seq for e in api.storage.get_events(gid)] == [0, 1]
+
+
+def test_taken_seq_is_a_409_and_drops_the_cached_game():
+    gid = start_game()
+    api.storage.write_events([GameEvent(gid, 1, MOVE, {"player": "alice", "row": 2, "col": 2, "symbol": "X"})], [])
+    with pytest.raises(HTTPException) as e:
+        move(gid, 1, 1)
+    assert e.value.status_code == 409
+    assert gid not in api.sessions_db
+    assert asyncio.run(api.load_session(gid)).serialize_board()[2][2] == "X"
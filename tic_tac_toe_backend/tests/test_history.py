@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import pytest
+
+from src.api.events import CREATED, MOVE, GameEvent
+from src.api.storage import MemoryStorage, SQLiteStorage
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    store = MemoryStorage() if request.param == "memory" else SQLiteStorage(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def add_users(storage, *names):
+    return {name: storage.add_user(f"{name}@example.com", name, "hash")["id"] for name in names}
+
+
+def new_game(storage, users, x: str, o: str) -> int:
+    return storage.create_game([x, o], [users[x], users[o]], False, 3, 3, datetime(2024, 1, 1))
+
+
+def play(storage, game_id: int, moves: int) -> None:
+    storage.write_events([GameEvent(game_id, 0, CREATED, {})], [])
+    storage.write_events([GameEvent(game_id, seq, MOVE, {}) for seq in range(1, moves + 1)], [])
+
+
+def pages(storage, user_id: int, limit: int, **filters):
+    """Every page of the user's history, following each page's last id as the next cursor."""
+    result, before = [], None
+    while True:
+        page = storage.user_games_page(user_id, before=before, limit=limit, **filters)
+        result.append([game["id"] for game in page])
+        if len(page) < limit:
+            return result
+        before = page[-1]["id"]
+
+
+def test_pages_are_newest_first_and_split_on_limit(storage):
+    users = add_users(storage, "alice", "bob")
+    ids = [new_game(storage, users, "alice", "bob") for _ in range(5)]
+    assert pages(storage, users["alice"], 2) == [ids[4:2:-1], ids[2:0:-1], ids[:1]]
+    assert pages(storage, users["bob"], 5) == [ids[::-1], []]
+    assert storage.user_games_page(users["alice"], before=ids[0]) == []
+    assert storage.user_games_page(users["alice"], before=ids[3], limit=1)[0]["id"] == ids[2]
+
+
+def test_filters_follow_games_from_ongoing_to_finished(storage):
+    users = add_users(storage, "alice", "bob", "carol")
+    vs_bob = [new_game(storage, users, "alice", "bob") for _ in range(3)]
+    vs_carol = [new_game(storage, users, "carol", "alice") for _ in range(3)]
+    alice = users["alice"]
+    assert pages(storage, alice, 2, result="ongoing", opponent="bob") == [vs_bob[:0:-1], vs_bob[:1]]
+
+    storage.finish_game(vs_bob[0], "X", datetime(2024, 1, 2))
+    storage.finish_game(vs_bob[2], "O", datetime(2024, 1, 2))
+    storage.finish_game(vs_carol[1], "X", datetime(2024, 1, 2))
+    storage.finish_game(vs_carol[2], None, datetime(2024, 1, 2))
+
+    def ids(**filters):
+        return [game["id"] for game in storage.user_games_page(alice, **filters)]
+
+    assert ids(result="won") == [vs_bob[0]]
+    assert ids(result="lost") == [vs_carol[1], vs_bob[2]]
+    assert ids(result="draw") == [vs_carol[2]]
+    assert ids(result="ongoing") == [vs_carol[0], vs_bob[1]]
+    assert ids(opponent="carol") == vs_carol[::-1]
+    assert ids(result="lost", opponent="bob") == [vs_bob[2]]
+    assert ids(result="lost", opponent="carol") == [vs_carol[1]]
+    assert ids(result="ongoing", opponent="bob") == [vs_bob[1]]
+    assert ids(result="won", opponent="carol") == []
+    assert [game["id"] for game in storage.user_games_page(users["carol"], result="won")] == [vs_carol[1]]
+    assert pages(storage, alice, 1, result="lost") == [[vs_carol[1]], [vs_bob[2]], []]
+
+
+def test_moves_count_grows_as_moves_are_written(storage):
+    users = add_users(storage, "alice", "bob")
+    game_id = new_game(storage, users, "alice", "bob")
+    play(storage, game_id, 4)
+    assert storage.user_games_page(users["alice"])[0]["moves_count"] == 4
+    storage.write_events([GameEvent(game_id, 5, MOVE, {})], [])
+    storage.finish_game(game_id, "X", datetime(2024, 1, 2))
+    assert storage.get_game(game_id)["moves_count"] == 5
+    assert storage.user_games_page(users["bob"], result="lost")[0]["moves_count"] == 5
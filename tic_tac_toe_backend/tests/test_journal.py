@@ -0,0 +1,208 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.api.events import CREATED, MOVE, GameEvent
+from src.api.journal import EventJournal
+from src.api.storage import DuplicateEventError, MemoryStorage
+
+
+class FlakyStorage(MemoryStorage):
+    """MemoryStorage whose next `failures` write_events calls raise OSError."""
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.failures = failures
+        self.calls = 0
+
+    def write_events(self, events, snapshots):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk unavailable")
+        super().write_events(events, snapshots)
+
+
+def new_game(storage: MemoryStorage) -> int:
+    return storage.create_game(["alice", "bob"], [1, 2], False, 3, 3, datetime(2024, 1, 1))
+
+
+def events(game_id: int, start: int, stop: int):
+    return [GameEvent(game_id, seq, CREATED if seq == 0 else MOVE, {"seq": seq}) for seq in range(start, stop)]
+
+
+def stored_seqs(storage: MemoryStorage, game_id: int):
+    return [e.seq for e in storage.get_events(game_id)]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_flush_writes_one_batch_of_at_most_batch_size():
+    storage = MemoryStorage()
+    gid = new_game(storage)
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=60, batch_size=3)
+        for event in events(gid, 0, 5):
+            await journal.append(event)
+        await journal.flush()
+        return journal
+
+    journal = run(scenario())
+    assert stored_seqs(storage, gid) == [0, 1, 2]
+    assert len(journal) == 2
+    assert journal.metrics()["flushed"] == 3
+
+
+def test_snapshot_waits_for_the_events_it_covers():
+    storage = MemoryStorage()
+    gid = new_game(storage)
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=60, batch_size=2)
+        for event in events(gid, 0, 3):
+            await journal.append(event, {"seq": event.seq + 1})
+        await journal.flush()
+        held_back = storage.get_snapshot(gid)
+        await journal.flush()
+        return held_back
+
+    assert run(scenario()) is None
+    assert storage.get_snapshot(gid)["seq"] == 3
+
+
+def test_background_task_flushes_every_interval():
+    storage = MemoryStorage()
+    gid = new_game(storage)
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=0.01)
+        for event in events(gid, 0, 4):
+            await journal.append(event)
+        await asyncio.sleep(0.1)
+        seqs = stored_seqs(storage, gid)
+        await journal.stop()
+        return seqs
+
+    assert run(scenario()) == [0, 1, 2, 3]
+
+
+def test_failed_flush_requeues_in_order_and_retries():
+    storage = FlakyStorage(failures=2)
+    gid = new_game(storage)
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=0.01)
+        for event in events(gid, 0, 3):
+            await journal.append(event, {"seq": event.seq + 1})
+        await asyncio.sleep(0.1)
+        await journal.stop()
+        return journal
+
+    journal = run(scenario())
+    assert storage.calls == 3
+    assert stored_seqs(storage, gid) == [0, 1, 2]
+    assert storage.get_snapshot(gid)["seq"] == 3
+    assert len(journal) == 0
+
+
+def test_append_flushes_itself_at_max_pending():
+    storage = MemoryStorage()
+    gid = new_game(storage)
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=60, batch_size=10, max_pending=4)
+        for event in events(gid, 0, 4):
+            await journal.append(event)
+        return journal
+
+    journal = run(scenario())
+    assert stored_seqs(storage, gid) == [0, 1, 2, 3]
+    assert len(journal) == 0
+
+
+def test_duplicate_seq_is_dropped_not_retried():
+    storage = MemoryStorage()
+    gid, other = new_game(storage), new_game(storage)
+    storage.write_events(events(gid, 0, 1), [])  # another worker stored seq 0 first
+
+    refused = []
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=60, on_refused=refused.append)
+        for event in events(gid, 0, 3) + events(other, 0, 2):
+            await journal.append(event, {"seq": event.seq + 1})
+        await journal.drain()
+        return journal
+
+    journal = run(scenario())
+    assert stored_seqs(storage, gid) == [0]
+    assert storage.get_events(gid)[0].data == {"seq": 0}
+    assert stored_seqs(storage, other) == [0, 1]
+    assert storage.get_snapshot(gid) is None  # would cover the refused event
+    assert storage.get_snapshot(other)["seq"] == 2
+    assert refused == [gid]
+    metrics = journal.metrics()
+    assert (metrics["rejected"], metrics["rejected_snapshots"], metrics["pending"]) == (3, 1, 0)
+
+
+def test_refused_event_drops_the_rest_of_its_game_queued_behind_it():
+    storage = MemoryStorage()
+    gid, other = new_game(storage), new_game(storage)
+    log = events(gid, 0, 8)
+    log[5] = log[5]._replace(data={"when": datetime(2024, 1, 1)})  # not JSON: refused by SQLite
+    refused = []
+
+    class StrictStorage(MemoryStorage):
+        def write_events(self, batch, snapshots):
+            if any(isinstance(v, datetime) for e in batch for v in e.data.values()):
+                raise TypeError("Object of type datetime is not JSON serializable")
+            storage.write_events(batch, snapshots)
+
+    async def scenario():
+        journal = EventJournal(StrictStorage(), flush_interval=60, batch_size=4, on_refused=refused.append)
+        for event in log[:7] + events(other, 0, 2):
+            await journal.append(event, {"seq": event.seq + 1})
+        await journal.append(log[7])
+        await journal.drain()
+        return journal
+
+    journal = run(scenario())
+    assert stored_seqs(storage, gid) == [0, 1, 2, 3, 4]
+    assert stored_seqs(storage, other) == [0, 1]
+    assert storage.get_snapshot(gid) is None
+    assert refused == [gid]
+    assert journal.metrics()["rejected"] == 3
+
+
+def test_stop_drains_everything_queued():
+    storage = MemoryStorage()
+    gid = new_game(storage)
+
+    async def scenario():
+        journal = EventJournal(storage, flush_interval=60, batch_size=2)
+        await journal.start()
+        for event in events(gid, 0, 7):
+            await journal.append(event)
+        await journal.stop()
+        return journal
+
+    journal = run(scenario())
+    assert stored_seqs(storage, gid) == list(range(7))
+    assert journal.metrics()["batches"] == 4
+
+
+def test_memory_storage_refuses_gaps_and_duplicates_atomically():
+    storage = MemoryStorage()
+    gid = new_game(storage)
+    storage.write_events(events(gid, 0, 2), [])
+    with pytest.raises(ValueError):
+        storage.write_events(events(gid, 2, 3) + events(gid, 4, 5), [])
+    with pytest.raises(DuplicateEventError):
+        storage.write_events(events(gid, 2, 3) + events(gid, 1, 2), [])
+    assert stored_seqs(storage, gid) == [0, 1]
+    storage.write_events(events(gid, 2, 4), [])
+    assert [e.seq for e in storage.get_events(gid, since=3)] == [3]
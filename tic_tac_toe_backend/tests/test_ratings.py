@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.api.ratings import DEFAULT_RATING, FIXED_RATINGS, GameArrays, batch_elo, elo_update
+
+
+def random_games(players: int, count: int, seed: int = 0) -> GameArrays:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, players, count).astype(np.int32)
+    b = rng.integers(0, players, count).astype(np.int32)  # includes some self-play
+    names = ["AI"] + [f"user{i}" for i in range(1, players)]
+    return GameArrays(names, a, b, rng.choice([0.0, 0.5, 1.0], count))
+
+
+def one_by_one(games: GameArrays) -> np.ndarray:
+    ratings = {name: FIXED_RATINGS.get(name, DEFAULT_RATING) for name in games.names}
+    for x, o, score in zip(games.a.tolist(), games.b.tolist(), games.score_a.tolist()):
+        nx, no = games.names[x], games.names[o]
+        new_x, new_o = elo_update(ratings[nx], ratings[no], score)
+        if nx not in FIXED_RATINGS:
+            ratings[nx] = new_x
+        if no not in FIXED_RATINGS:
+            ratings[no] = new_o
+    return np.array([ratings[name] for name in games.names])
+
+
+# Few players take the game-by-game path, many players the vectorised one.
+@pytest.mark.parametrize("players, count", [(4, 3_000), (50, 20_000), (200_000, 20_000)])
+def test_batch_elo_matches_one_game_at_a_time(players, count):
+    games = random_games(players, count)
+    ratings = batch_elo(games)
+    assert ratings[0] == FIXED_RATINGS["AI"]
+    np.testing.assert_allclose(ratings, one_by_one(games), rtol=0, atol=1e-9)
+
+
+def test_batch_elo_without_games():
+    games = GameArrays(["AI", "alice"], np.zeros(0, np.int32), np.zeros(0, np.int32), np.zeros(0))
+    assert batch_elo(games).tolist() == [FIXED_RATINGS["AI"], DEFAULT_RATING]
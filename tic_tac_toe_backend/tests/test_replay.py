@@ -0,0 +1,86 @@
+import copy
+import json
+import random
+from datetime import datetime
+
+import pytest
+
+from src.api.bitboard import BitboardGame
+from src.api.core import TicTacToeGame
+from src.api.events import (
+    AI_MOVE, CREATED, FINISHED, MOVE, GameEvent, apply_event, replay, restore_snapshot, take_snapshot,
+)
+from src.api.session import GameSession
+
+
+def fresh(size: int, k: int) -> GameSession:
+    game = BitboardGame() if size == 3 else TicTacToeGame(size=size, k=k)
+    return GameSession(1, game, ("alice", "AI"), True, 0)
+
+
+def play_random_game(size: int, k: int, rng: random.Random):
+    """The event log of a random game, as record_event would write it, and the session it built."""
+    rec = fresh(size, k)
+    log = []
+
+    def emit(kind: str, data: dict):
+        event = GameEvent(rec.id, rec.seq, kind, data)
+        result = apply_event(rec, event)
+        log.append(event)
+        return result
+
+    emit(CREATED, {"players": ["alice", "AI"], "is_ai": True, "size": size, "k": k, "created_at": None})
+    cells = rng.sample(range(size * size), size * size)
+    for i, cell in enumerate(cells[:rng.randint(1, size * size)]):
+        kind, player = (MOVE, "alice") if i % 2 == 0 else (AI_MOVE, "AI")
+        result = emit(kind, {"player": player, "row": cell // size, "col": cell % size, "symbol": rec.game.current})
+        assert result
+        if result.finished:
+            emit(FINISHED, {"winner": result.winner, "completed_at": datetime(2024, 1, 1).isoformat()})
+            break
+    return log, rec
+
+
+def state(rec: GameSession) -> tuple:
+    return (rec.seq, rec.game.serialize_board(), rec.game.current, rec.moves.tolist(), rec.winner,
+            rec.completed_at)
+
+
+def next_moves(rec: GameSession) -> list:
+    """What every possible next move would do, so hidden engine state (move count, winner) is compared too."""
+    results = []
+    for cell in range(rec.size * rec.size):
+        probe = copy.deepcopy(rec.game)
+        result = probe.make_move(cell // rec.size, cell % rec.size, probe.current)
+        results.append((bool(result), result.winner, result.draw, probe.current))
+    return results
+
+
+@pytest.mark.parametrize("size,k", [(3, 3), (5, 4), (7, 5)])
+def test_snapshot_at_any_seq_plus_replay_matches_full_replay(size, k):
+    rng = random.Random(size)
+    for _ in range(30):
+        log, played = play_random_game(size, k, rng)
+        full = replay(fresh(size, k), None, log)
+        assert state(full) == state(played)
+        for cut in range(1, len(log) + 1):
+            prefix = replay(fresh(size, k), None, log[:cut])
+            # Stored snapshots go through JSON (SQLite keeps them as text).
+            snapshot = json.loads(json.dumps(take_snapshot(prefix)))
+            rebuilt = replay(fresh(size, k), snapshot, log[cut:])
+            assert state(rebuilt) == state(full)
+            assert next_moves(rebuilt) == next_moves(full)
+
+
+def test_replay_skips_events_the_snapshot_already_covers():
+    log, played = play_random_game(3, 3, random.Random(7))
+    snapshot = take_snapshot(replay(fresh(3, 3), None, log[:4]))
+    rebuilt = replay(fresh(3, 3), snapshot, log)  # the whole log, not just the tail
+    assert state(rebuilt) == state(played)
+
+
+def test_restore_sets_seq_and_snapshot_seq():
+    log, played = play_random_game(5, 4, random.Random(3))
+    rec = fresh(5, 4)
+    restore_snapshot(rec, take_snapshot(played))
+    assert rec.seq == rec.snapshot_seq == played.seq
@@ -0,0 +1,73 @@
+import bisect
+import random
+
+import pytest
+
+from src.api.skiplist import RankedSkipList
+
+
+def check_against(skiplist: RankedSkipList, expected: list, rng: random.Random) -> None:
+    assert len(skiplist) == len(expected)
+    assert list(skiplist) == expected
+    for i, key in enumerate(expected):
+        assert skiplist.index(key) == i
+    n = len(expected)
+    for _ in range(20):
+        offset, limit = rng.randint(0, n + 2), rng.randint(0, n + 2)
+        assert skiplist.slice(offset, limit) == expected[offset:offset + limit]
+    for i in (0, n // 2, n - 1, n):
+        assert list(skiplist.iter_from(i)) == expected[max(i, 0):]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_inserts_and_removes_match_a_sorted_list(seed):
+    rng = random.Random(seed)
+    skiplist = RankedSkipList(seed)
+    expected: list = []
+    for step in range(2000):
+        if expected and rng.random() < 0.4:
+            key = rng.choice(expected)
+            skiplist.remove(key)
+            expected.remove(key)
+        else:
+            key = rng.randrange(10_000)
+            if key in expected:
+                continue
+            skiplist.insert(key)
+            bisect.insort(expected, key)
+        if step % 250 == 0:
+            check_against(skiplist, expected, rng)
+    check_against(skiplist, expected, rng)
+
+
+def test_tuple_keys_sort_like_the_leaderboard():
+    keys = [(-1500.0, -3, 1, "carol"), (-1532.5, -5, 0, "alice"), (-1500.0, -3, 1, "bob"), (-1468.0, 0, 4, "dave")]
+    skiplist = RankedSkipList(1)
+    for key in keys:
+        skiplist.insert(key)
+    assert list(skiplist) == sorted(keys)
+    assert skiplist.index((-1500.0, -3, 1, "bob")) == 1
+    assert skiplist.slice(1, 2) == sorted(keys)[1:3]
+
+
+def test_missing_and_duplicate_keys_raise():
+    skiplist = RankedSkipList(0)
+    skiplist.insert(5)
+    with pytest.raises(KeyError):
+        skiplist.insert(5)
+    with pytest.raises(KeyError):
+        skiplist.remove(6)
+    with pytest.raises(KeyError):
+        skiplist.index(4)
+    assert len(skiplist) == 1
+
+
+def test_empty_and_out_of_range_positions():
+    skiplist = RankedSkipList(0)
+    assert skiplist.slice(0, 10) == []
+    for key in range(3):
+        skiplist.insert(key)
+    assert skiplist.slice(3, 5) == []
+    assert skiplist.slice(100, 5) == []
+    assert skiplist.slice(-2, 2) == [0, 1]
+    assert skiplist.slice(1, 0) == []
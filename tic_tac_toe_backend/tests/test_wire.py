@@ -0,0 +1,74 @@
+import json
+import random
+
+import pytest
+
+from src.api import main as api
+from src.api.archive import ArchivedGame
+from src.api.bus import GameUpdate
+from src.api.session import GameSession
+from src.api.wire import BINARY, JSON, decode_frame, decode_move, encode_delta, encode_state
+
+
+def random_session(size: int, k: int, rng: random.Random) -> GameSession:
+    """A random game, stopped after a random number of moves or when it ends."""
+    game_rec = GameSession(1, api.new_game(size, k), ("alice", "bob"), False, 0)
+    for cell in rng.sample(range(size * size), rng.randint(0, size * size)):
+        game = game_rec.game
+        result = game.make_move(cell // size, cell % size, game.current)
+        game_rec.add_move(cell // size, cell % size)
+        if result.finished:
+            game_rec.winner = result.winner
+            break
+    return game_rec
+
+
+@pytest.mark.parametrize("size,k", [(3, 3), (4, 3), (5, 4), (15, 5)])
+def test_binary_state_decodes_to_the_json_state(size, k):
+    rng = random.Random(size)
+    for _ in range(50):
+        game_rec = random_session(size, k, rng)
+        frame = api.state_frame(game_rec, BINARY)
+        assert decode_frame(frame) == json.loads(api.state_frame(game_rec, JSON))
+        assert len(frame) == (1 if size == 3 else 2) + (2 * size * size + 7) // 8
+
+
+def test_archived_game_state_round_trips():
+    rng = random.Random(5)
+    for _ in range(50):
+        game_rec = random_session(3, 3, rng)
+        if game_rec.winner is None and not game_rec.game.is_draw():
+            continue
+        game_rec.completed_at = 0
+        archived = ArchivedGame.from_session(game_rec)
+        assert decode_frame(api.state_frame(archived, BINARY)) == json.loads(api.state_frame(archived, JSON))
+
+
+def test_classic_state_is_four_bytes():
+    assert len(encode_state(3, [4, 0, 8], None, False)) == 4
+
+
+@pytest.mark.parametrize("size", [3, 7, 15])
+def test_binary_delta_decodes_to_the_json_delta(size):
+    rng = random.Random(size)
+    outcomes = [(None, False, "X"), (None, False, "O"), ("X", False, None), ("O", False, None), (None, True, None)]
+    for winner, draw, next_turn in outcomes:
+        cells = rng.sample(range(size * size), 2)
+        moves = [(cells[0] // size, cells[0] % size, "X"), (cells[1] // size, cells[1] % size, "O")]
+        update = GameUpdate(1, size, ("alice", "AI"), moves, winner, draw, next_turn, [])
+        expected = json.loads(api.delta_frame(update, JSON))
+        assert decode_frame(api.delta_frame(update, BINARY), size) == expected
+        assert len(encode_delta(size, moves, winner, draw, next_turn)) == 1 + 2 * len(moves)
+
+
+@pytest.mark.parametrize("size", [3, 15])
+def test_move_frames_round_trip(size):
+    for cell in range(size * size):
+        assert decode_move(cell.to_bytes(2, "little"), size) == divmod(cell, size)
+
+
+def test_bad_move_frames_are_rejected():
+    assert decode_move(b"", 3) is None
+    assert decode_move(b"\x04", 3) is None
+    assert decode_move(b"\x04\x00\x00", 3) is None
+    assert decode_move((9).to_bytes(2, "little"), 3) is None